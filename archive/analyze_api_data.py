@@ -13,7 +13,11 @@ Outputs:
 """
 
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import pyarrow as pa
+import pyarrow.csv as pv
+import csv
 import json
 import os
 
@@ -23,11 +27,19 @@ BASE_URL = "https://api.joshuaproject.net/v1/people_groups.json"
 CSV_PATH = "AllPeoplesInCountry.csv"
 OUTPUT_JSON = "api_data_sample.json"
 
+# Pooled session: reuses TCP/TLS connections and retries transient 5xx errors
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=10,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+))
+
 def fetch_data(limit=50):
     url = f"{BASE_URL}?api_key={API_KEY}&limit={limit}"
     print(f"Fetching data from {url}...")
     try:
-        response = requests.get(url)
+        response = _SESSION.get(url, timeout=(3.05, 30))
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -58,48 +70,64 @@ def compare_with_csv(api_data, csv_path):
 
     print(f"\nLoading CSV from {csv_path}...")
     try:
-        # Skip first 2 lines as per previous analysis script
-        df = pd.read_csv(csv_path, skiprows=2)
-        print(f"Loaded {len(df)} rows from CSV.")
+        # Skip first 2 lines as per previous analysis script; read the header
+        # ourselves so column names can be stripped before pyarrow sees them
+        with open(csv_path, newline='', encoding='utf-8-sig') as f:
+            for _ in range(2):
+                next(f)
+            columns = [c.strip() for c in next(csv.reader(f))]
+
+        # Only the columns compared below are parsed, all as strings; footer
+        # rows with the wrong field count are skipped
+        wanted = [c for c in ('PeopleID3', 'PeopNameInCountry', 'Population') if c in columns]
+        table = pv.read_csv(
+            csv_path,
+            read_options=pv.ReadOptions(skip_rows=3, column_names=columns),
+            parse_options=pv.ParseOptions(invalid_row_handler=lambda row: 'skip'),
+            convert_options=pv.ConvertOptions(include_columns=wanted,
+                                              column_types={c: pa.string() for c in wanted})
+        )
+        print(f"Loaded {table.num_rows} rows from CSV.")
     except Exception as e:
         print(f"Error reading CSV: {e}")
         return
 
-    # Clean columns just in case
-    df.columns = df.columns.str.strip()
-
     print("\nComparing API sample with CSV data (matching on PeopleID3)...")
     
     matches = 0
     mismatches = 0
     
     # Prepare CSV data for matching
-    if 'PeopleID3' not in df.columns:
+    if 'PeopleID3' not in table.column_names:
         print("PeopleID3 column missing in CSV.")
         return
-        
-    # Create a string column for PeopleID3 to handle float/int discrepancies
-    # Handle NaN values and convert float (e.g. 10208.0) to int (10208) then string
-    df_clean = df.dropna(subset=['PeopleID3']).copy()
-    df_clean['PeopleID3_str'] = df_clean['PeopleID3'].astype(int).astype(str).str.strip()
+
+    # Build the PeopleID3 -> (name, population) index once so each API record
+    # is an O(1) dict lookup. IDs are normalized via int so '10208.0' and
+    # '10208' agree; blank IDs are dropped and the first CSV row wins.
+    def column(name):
+        return table.column(name).to_pylist() if name in table.column_names else [None] * table.num_rows
+
+    lookup = {}
+    for pid, name, pop in zip(column('PeopleID3'), column('PeopNameInCountry'), column('Population')):
+        if pid and pid.strip():
+            lookup.setdefault(str(int(float(pid))), (name, pop))
 
     for record in api_data:
         # API PeopleID3 might be int or str
         pid_api = record.get("PeopleID3")
         pid_api_str = str(pid_api).strip()
         
-        # Find in DF
-        match = df_clean[df_clean['PeopleID3_str'] == pid_api_str]
+        # Find in CSV index
+        match = lookup.get(pid_api_str)
         
-        if not match.empty:
+        if match is not None:
             matches += 1
-            csv_row = match.iloc[0]
             # Compare a few fields
             api_name = record.get("PeopNameInCountry")
-            csv_name = csv_row.get("PeopNameInCountry")
+            csv_name, csv_pop = match
             
             api_pop = record.get("Population")
-            csv_pop = csv_row.get("Population")
             
             if matches <= 5: # Print first 5 matches details
                 print(f"Match found for PeopleID3 {pid_api}:")
@@ -1,7 +1,7 @@
 """
 File Purpose: Analyze and compare Joshua Project data files.
 Primary Functions:
-- Load CSV data into pandas DataFrames.
+- Load CSV data into keyed dicts (csv module, no pandas).
 - Compare 'master' dataset (AllPeoplesInCountry.csv) with CPPI cross-reference dataset.
 - Identify duplicates, unique records, and data discrepancies.
 - Generate a summary report.
@@ -13,7 +13,8 @@ Outputs:
 - joshua_data_summary.md (Report file)
 """
 
-import pandas as pd
+import csv
+import heapq
 import os
 
 # Paths
@@ -22,62 +23,80 @@ MASTER_CSV = os.path.join(BASE_DIR, "AllPeoplesInCountry.csv")
 CPPI_CSV = os.path.join(BASE_DIR, "extracted_cppi", "jp-cppi-cross-reference.csv")
 OUTPUT_REPORT = os.path.join(BASE_DIR, "joshua_data_summary.md")
 
+JOIN_KEYS = ['ROG3', 'PeopleID3']
+
+def clean_pop(val):
+    """Parse a non-blank population cell such as '1,234'."""
+    return float(val.replace(',', ''))
+
+def load_csv(path, label, encoding, pop_col, name_col, skip_lines=0):
+    """
+    Read a CSV into {(ROG3, PeopleID3): (population, name)}.
+
+    Population is kept as the raw stripped cell ('' if blank) and only parsed
+    for keys present in both files. Returns (rows, row_count, has_pop),
+    or (None, 0, False) if a join key is missing.
+    """
+    with open(path, newline='', encoding=encoding) as f:
+        for _ in range(skip_lines):
+            next(f)
+        reader = csv.DictReader(f)
+        # Strip whitespace from column names
+        reader.fieldnames = [h.strip() for h in reader.fieldnames]
+
+        for key in JOIN_KEYS:
+            if key not in reader.fieldnames:
+                print(f"Error: '{key}' not in {label}.")
+                return None, 0, False
+
+        has_pop = pop_col in reader.fieldnames
+        rows = {}
+        count = 0
+        for row in reader:
+            count += 1
+            rog3 = (row['ROG3'] or '').strip()
+            people_id3 = (row['PeopleID3'] or '').strip()
+            if not rog3 or not people_id3:
+                continue
+            pop = (row[pop_col] or '').strip() if has_pop else ''
+            rows[(rog3, people_id3)] = (pop, row.get(name_col))
+        return rows, count, has_pop
+
 def load_data():
-    """Load the CSV files into DataFrames."""
+    """Load the CSV files into {(ROG3, PeopleID3): (population, name)} dicts."""
     print("Loading data...")
     try:
         # Load Master - Skip first 2 lines (Title + Blank)
-        master_df = pd.read_csv(MASTER_CSV, encoding='utf-8', on_bad_lines='skip', skiprows=2)
-        print(f"Loaded Master CSV: {len(master_df)} rows")
+        master = load_csv(MASTER_CSV, 'Master', 'utf-8', 'Population',
+                          'PeopNameInCountry', skip_lines=2)
+        print(f"Loaded Master CSV: {master[1]} rows")
         
         # Load CPPI
         # CPPI might have encoding issues or whitespace in headers
-        cppi_df = pd.read_csv(CPPI_CSV, encoding='latin1', on_bad_lines='skip') # Fallback encoding often needed
-        print(f"Loaded CPPI CSV: {len(cppi_df)} rows")
+        cppi = load_csv(CPPI_CSV, 'CPPI', 'latin1', 'JPPopulation',
+                        'JPPeopleGroup') # Fallback encoding often needed
+        print(f"Loaded CPPI CSV: {cppi[1]} rows")
         
-        return master_df, cppi_df
+        if master[0] is None or cppi[0] is None:
+            return None, None
+        return master, cppi
     except Exception as e:
         print(f"Error loading data: {e}")
         return None, None
 
-def clean_columns(df):
-    """Strip whitespace from column names."""
-    df.columns = df.columns.str.strip()
-    return df
-
-def analyze(master_df, cppi_df):
-    """Compare the two DataFrames."""
+def analyze(master_data, cppi_data):
+    """Compare the two datasets by ROG3 + PeopleID3."""
     print("\nAnalyzing data...")
-    
-    # Clean headers
-    master_df = clean_columns(master_df)
-    cppi_df = clean_columns(cppi_df)
-    
-    # Check for keys
-    join_keys = ['ROG3', 'PeopleID3']
-    for key in join_keys:
-        if key not in master_df.columns:
-            print(f"Error: '{key}' not in Master.")
-            return
-        if key not in cppi_df.columns:
-            print(f"Error: '{key}' not in CPPI.")
-            return
-
-    # Convert keys to string
-    for key in join_keys:
-        master_df[key] = master_df[key].astype(str).str.strip()
-        cppi_df[key] = cppi_df[key].astype(str).str.strip()
 
-    # Create a composite key for easier set operations
-    master_df['KEY'] = master_df['ROG3'] + "_" + master_df['PeopleID3']
-    cppi_df['KEY'] = cppi_df['ROG3'] + "_" + cppi_df['PeopleID3']
+    master, master_count, master_has_pop = master_data
+    cppi, cppi_count, cppi_has_pop = cppi_data
 
     # Sets of Keys
-    master_keys = set(master_df['KEY'])
-    cppi_keys = set(cppi_df['KEY'])
+    master_keys = master.keys()
+    cppi_keys = cppi.keys()
     
     # Intersections and differences
-    common_keys = master_keys.intersection(cppi_keys)
+    common_keys = master_keys & cppi_keys
     only_master_keys = master_keys - cppi_keys
     only_cppi_keys = cppi_keys - master_keys
     
@@ -85,8 +104,8 @@ def analyze(master_df, cppi_df):
     summary = []
     summary.append("# Joshua Project Data Analysis Summary\n")
     summary.append(f"## Dataset Overview")
-    summary.append(f"- **Master Dataset** (`AllPeoplesInCountry.csv`): {len(master_df)} records")
-    summary.append(f"- **CPPI Cross-Ref** (`jp-cppi-cross-reference.csv`): {len(cppi_df)} records")
+    summary.append(f"- **Master Dataset** (`AllPeoplesInCountry.csv`): {master_count} records")
+    summary.append(f"- **CPPI Cross-Ref** (`jp-cppi-cross-reference.csv`): {cppi_count} records")
     
     summary.append(f"\n## Comparison by ROG3 + PeopleID3")
     summary.append(f"- **Common Records**: {len(common_keys)}")
@@ -96,38 +115,27 @@ def analyze(master_df, cppi_df):
     # Data Consistency Check (Population)
     summary.append(f"\n## Data Consistency (Common Records)")
     
-    if 'Population' in master_df.columns and 'JPPopulation' in cppi_df.columns:
-        # Merge on Keys
-        merged = pd.merge(master_df, cppi_df, on=join_keys, suffixes=('_master', '_cppi'))
-        
-        def clean_pop(val):
-            if isinstance(val, str):
-                val = val.replace(',', '').strip()
-                if val == '': return 0.0
-                return float(val)
-            return float(val)
-
-        merged['Population_master'] = merged['Population'].apply(clean_pop)
-        merged['JPPopulation_cppi'] = merged['JPPopulation'].apply(clean_pop)
-        
-        merged['diff'] = merged['Population_master'] - merged['JPPopulation_cppi']
+    if master_has_pop and cppi_has_pop:
+        # Parse populations for common keys only (blank populations compare as neither)
+        pops = {k: (clean_pop(master[k][0]), clean_pop(cppi[k][0])) for k in common_keys
+                if master[k][0] and cppi[k][0]}
+        diffs = [(k, pop_master - pop_cppi) for k, (pop_master, pop_cppi) in pops.items()]
         # Consider a match if difference is small (e.g. < 10) just in case
-        exact_matches = merged[merged['diff'].abs() < 1]
-        discrepancies = merged[merged['diff'].abs() >= 1]
+        exact_matches = sum(1 for _, d in diffs if abs(d) < 1)
+        discrepancies = [(k, d) for k, d in diffs if abs(d) >= 1]
         
-        summary.append(f"- **Population Exact Matches**: {len(exact_matches)} / {len(merged)}")
+        summary.append(f"- **Population Exact Matches**: {exact_matches} / {len(common_keys)}")
         summary.append(f"- **Population Discrepancies**: {len(discrepancies)}")
         
-        if not discrepancies.empty:
+        if discrepancies:
              summary.append(f"\n### Top 10 Population Discrepancies")
-             name_col_master = 'PeopNameInCountry' if 'PeopNameInCountry' in master_df.columns else 'JPPeopleGroup_master'
-             name_col_cppi = 'JPPeopleGroup' if 'JPPeopleGroup' in cppi_df.columns else 'JPPeopleGroup_cppi'
-             
              summary.append(f"| ROG3 | PeopleID3 | Name | Pop (Master) | Pop (CPPI) | Diff |")
              summary.append("|---|---|---|---|---|---|")
-             for _, row in discrepancies.sort_values('diff', key=abs, ascending=False).head(10).iterrows():
-                 name = row.get(name_col_master, 'N/A')
-                 summary.append(f"| {row['ROG3']} | {row['PeopleID3']} | {name} | {row['Population_master']:.0f} | {row['JPPopulation_cppi']:.0f} | {row['diff']:.0f} |")
+             for key, diff in heapq.nlargest(10, discrepancies, key=lambda kd: abs(kd[1])):
+                 rog3, people_id3 = key
+                 pop_master, pop_cppi = pops[key]
+                 name = master[key][1]
+                 summary.append(f"| {rog3} | {people_id3} | {name or 'N/A'} | {pop_master:.0f} | {pop_cppi:.0f} | {diff:.0f} |")
 
     else:
         summary.append("- Could not compare population (missing columns).")
@@ -140,6 +148,6 @@ def analyze(master_df, cppi_df):
     print(f"\nReport saved to: {OUTPUT_REPORT}")
 
 if __name__ == "__main__":
-    m_df, c_df = load_data()
-    if m_df is not None and c_df is not None:
-        analyze(m_df, c_df)
+    m_data, c_data = load_data()
+    if m_data is not None and c_data is not None:
+        analyze(m_data, c_data)
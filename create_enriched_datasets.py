@@ -13,34 +13,132 @@ Inputs:
 - joshua_project_languages.json
 
 Outputs:
-- joshua_project_enriched.json (full denormalized)
+- joshua_project_enriched.json (full denormalized) + .json.gz
+- joshua_project_enriched.arrow (Arrow IPC, memory-mappable)
 - joshua_project_enriched.parquet
-- joshua_project_unreached.json (unreached only)
+- joshua_project_unreached.json (unreached only) + .json.gz
 - joshua_project_unreached.parquet
 - enriched_metadata.json (stats and validation report)
+- .cache/lookups_<key>.pkl (reference lookups, reused while inputs are unchanged)
 """
 
+import glob
+import hashlib
 import json
 import os
+import pickle
 from datetime import datetime
 
-def load_datasets():
-    """Load all normalized datasets."""
+from data_utilities import dump_json_bytes, iter_json_array, open_gzip_writer
+
+# Normalized input files
+DATASET_FILES = {
+    'people_groups': 'joshua_project_full_dump.json',
+    'countries': 'joshua_project_countries.json',
+    'languages': 'joshua_project_languages_enriched_geo.json',  # Use geo-enriched version with family names
+    'totals': 'joshua_project_totals.json'
+}
+
+# Reference datasets whose lookups can be served from the pickle cache
+LOOKUP_DATASETS = ('countries', 'languages', 'totals')
+LOOKUP_CACHE_DIR = '.cache'
+
+# Embedded sub-record layouts: output key -> source field
+COUNTRY_DATA_FIELDS = {
+    'name': 'Ctry',
+    'continent': 'Continent',
+    'region': 'RegionName',
+    'percent_christianity': 'PercentChristianity',
+    'percent_evangelical': 'PercentEvangelical',
+    'total_peoples': 'CntPeoples',
+    'unreached_peoples': 'CntPeoplesLR',
+    'jp_scale': 'JPScaleCtry'
+}
+
+LANGUAGE_DATA_FIELDS = {
+    'name': 'Language',
+    'hub_country': 'HubCountry',
+    'bible_status': 'BibleStatus',
+    'bible_year': 'BibleYear',
+    'nt_year': 'NTYear',
+    'portions_year': 'PortionsYear',
+    'has_jesus_film': 'HasJesusFilm',
+    'has_audio_recordings': 'AudioRecordings',
+    'status': 'Status',
+    # Geographic enrichment fields from Glottolog
+    'latitude': 'latitude',
+    'longitude': 'longitude',
+    'glottocode': 'glottocode',
+    'family_name': 'family_name',
+    'family_id': 'family_id',
+    'macroarea': 'macroarea'
+}
+
+# Arrow types for the embedded sub-records in the Parquet exports
+COUNTRY_DATA_TYPES = {
+    'name': 'string',
+    'continent': 'string',
+    'region': 'string',
+    'percent_christianity': 'float64',
+    'percent_evangelical': 'float64',
+    'total_peoples': 'int64',
+    'unreached_peoples': 'int64',
+    'jp_scale': 'int64'
+}
+
+LANGUAGE_DATA_TYPES = {
+    'name': 'string',
+    'hub_country': 'string',
+    'bible_status': 'int64',
+    'bible_year': 'string',
+    'nt_year': 'string',
+    'portions_year': 'string',
+    'has_jesus_film': 'string',
+    'has_audio_recordings': 'string',
+    'status': 'string',
+    'latitude': 'float64',
+    'longitude': 'float64',
+    'glottocode': 'string',
+    'family_name': 'string',
+    'family_id': 'string',
+    'macroarea': 'string'
+}
+
+# Write buffer for the streamed JSON arrays (records are written one at a time)
+JSON_WRITE_BUFFER = 1 << 20
+
+# gzip level for the compressed JSON copies (6 = zlib default trade-off)
+JSON_GZIP_LEVEL = 6
+
+# Rows per RecordBatch when streaming Parquet output
+PARQUET_BATCH_SIZE = 4096
+
+def load_datasets(names=None):
+    """
+    Load normalized datasets (all of DATASET_FILES unless names is given).
+
+    people_groups is returned as a lazy record iterator (see
+    iter_json_array) since it is only walked once; the small reference
+    datasets are loaded fully.
+    """
     print("\n" + "="*70)
     print("LOADING NORMALIZED DATASETS")
     print("="*70)
 
     datasets = {}
 
-    files = {
-        'people_groups': 'joshua_project_full_dump.json',
-        'countries': 'joshua_project_countries.json',
-        'languages': 'joshua_project_languages_enriched_geo.json',  # Use geo-enriched version with family names
-        'totals': 'joshua_project_totals.json'
-    }
-
-    for name, filename in files.items():
+    for name in names or DATASET_FILES:
+        filename = DATASET_FILES[name]
         print(f"\nLoading {name}...")
+
+        if name == 'people_groups':
+            if not os.path.exists(filename):
+                print(f"  ❌ File not found: {filename}")
+                return None
+            print(f"  ✅ Streaming records from {filename}")
+            datasets[name] = iter_json_array(filename)
+            continue
+
         try:
             with open(filename, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -58,18 +156,91 @@ def load_datasets():
 
     return datasets
 
+def lookup_cache_path():
+    """
+    Pickle cache path for the reference lookups.
+
+    The key covers the reference files' mtimes and the sub-record layouts,
+    so editing either invalidates the cache. Returns None if a reference
+    file is missing.
+    """
+    parts = []
+    for name in LOOKUP_DATASETS:
+        filename = DATASET_FILES[name]
+        if not os.path.exists(filename):
+            return None
+        parts.append(f'{filename}:{os.path.getmtime(filename)}')
+    parts.append(repr((COUNTRY_DATA_FIELDS, LANGUAGE_DATA_FIELDS)))
+
+    cache_key = hashlib.md5('|'.join(parts).encode('utf-8')).hexdigest()
+    return os.path.join(LOOKUP_CACHE_DIR, f'lookups_{cache_key}.pkl')
+
+def load_lookup_cache(cache_path):
+    """Load (lookups, source_counts) from the pickle cache, or None if stale."""
+    if cache_path is None or not os.path.exists(cache_path):
+        return None
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached = pickle.load(f)
+        # A cache from an older layout (or not a dict at all) is rebuilt too
+        lookups, source_counts = cached['lookups'], cached['source_counts']
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable lookup cache {cache_path}: {e}")
+        return None
+
+    print(f"\n✅ Loaded lookups from cache {cache_path}")
+    return lookups, source_counts
+
+def save_lookup_cache(cache_path, lookups, source_counts):
+    """Pickle the lookups for the next run, replacing any stale caches."""
+    if cache_path is None:
+        return
+
+    try:
+        os.makedirs(LOOKUP_CACHE_DIR, exist_ok=True)
+        for stale in glob.glob(os.path.join(LOOKUP_CACHE_DIR, 'lookups_*.pkl')):
+            os.remove(stale)
+        with open(cache_path, 'wb') as f:
+            pickle.dump({'lookups': lookups, 'source_counts': source_counts}, f, protocol=5)
+    except Exception as e:
+        print(f"⚠️  Could not write lookup cache {cache_path}: {e}")
+
+def compile_projector(fields):
+    """
+    Compile a function that projects a source record onto a sub-record layout.
+
+    The generated function is a single dict display with every key and
+    source field inlined as a constant, rather than a loop over the field
+    table for each record.
+    """
+    items = ', '.join(f'{key!r}: get({source!r})' for key, source in fields.items())
+    source = f'def project(record):\n    get = record.get\n    return {{{items}}}\n'
+    namespace = {}
+    exec(compile(source, '<projector>', 'exec'), namespace)
+    return namespace['project']
+
 def create_lookups(datasets):
-    """Create fast lookup dictionaries."""
+    """
+    Create fast lookup dictionaries.
+
+    Countries and languages are projected to their embedded country_data /
+    language_data form here, once per code, so enrichment only has to attach
+    the pre-built sub-records.
+    """
     print("\n" + "="*70)
     print("CREATING LOOKUP INDICES")
     print("="*70)
 
-    # Country lookup by ROG3
-    countries_lookup = {c['ROG3']: c for c in datasets['countries']}
+    project_country = compile_projector(COUNTRY_DATA_FIELDS)
+    project_language = compile_projector(LANGUAGE_DATA_FIELDS)
+
+    # Country lookup by ROG3 -> country_data
+    countries_lookup = {c['ROG3']: project_country(c) for c in datasets['countries']}
     print(f"✅ Country lookup: {len(countries_lookup)} entries")
 
-    # Language lookup by ROL3
-    languages_lookup = {l['ROL3']: l for l in datasets['languages']}
+    # Language lookup by ROL3 -> language_data
+    languages_lookup = {l['ROL3']: project_language(l) for l in datasets['languages']}
     print(f"✅ Language lookup: {len(languages_lookup)} entries")
 
     # Totals as dict
@@ -83,90 +254,156 @@ def create_lookups(datasets):
     }
 
 def enrich_people_group(people_group, lookups):
-    """Enrich a single people group record with country and language data."""
-    enriched = people_group.copy()
-
-    # Add country data
-    country_code = people_group.get('ROG3')
-    if country_code and country_code in lookups['countries']:
-        country = lookups['countries'][country_code]
-        enriched['country_data'] = {
-            'name': country.get('Ctry'),
-            'continent': country.get('Continent'),
-            'region': country.get('RegionName'),
-            'percent_christianity': country.get('PercentChristianity'),
-            'percent_evangelical': country.get('PercentEvangelical'),
-            'total_peoples': country.get('CntPeoples'),
-            'unreached_peoples': country.get('CntPeoplesLR'),
-            'jp_scale': country.get('JPScaleCtry')
-        }
+    """
+    Enrich a single people group record with country and language data.
+
+    The record is updated in place (people groups are consumed once) and
+    returned. The embedded country_data / language_data dicts are shared by
+    every record with the same ROG3 / ROL3, so treat them as read-only.
+    """
+    country_data = lookups['countries'].get(people_group.get('ROG3'))
+    if country_data is not None:
+        people_group['country_data'] = country_data
+
+    language_data = lookups['languages'].get(people_group.get('ROL3'))
+    if language_data is not None:
+        people_group['language_data'] = language_data
+
+    return people_group
+
+class JsonArrayWriter:
+    """
+    Stream records into a JSON array file, one record per line.
+
+    Records are written as soon as they are produced, so the file never has
+    to be serialized from a fully materialized list. With gzip=True the same
+    bytes are also written to a gzip-compressed <filename>.gz in the same
+    pass. Output goes to <filename>.tmp files that close() renames into
+    place; write errors are reported once, the partial files are removed
+    and the writer is marked as failed.
+    """
+
+    def __init__(self, filename, description, gzip=False):
+        self.filename = filename
+        self.description = description
+        self.filenames = [filename] + ([filename + '.gz'] if gzip else [])
+        self.count = 0
+        self.ok = True
+        self._files = []
+        self._gzip_file = None
+        print(f"\nStreaming {description} to {', '.join(self.filenames)}...")
+        try:
+            self._files.append(open(filename + '.tmp', 'wb', buffering=JSON_WRITE_BUFFER))
+            if gzip:
+                # The gzip header records the final name, not the .tmp path
+                self._gzip_file = open(filename + '.gz.tmp', 'wb')
+                self._files.append(open_gzip_writer(self._gzip_file, JSON_GZIP_LEVEL, filename + '.gz'))
+            self._write(b'[')
+        except Exception as e:
+            self._fail(e)
+
+    def _write(self, data):
+        for f in self._files:
+            f.write(data)
+
+    def _fail(self, error):
+        print(f"❌ Error saving {self.filename}: {error}")
+        self.abort()
+
+    def abort(self):
+        """Stop writing and remove the partial .tmp files."""
+        self.ok = False
+        for f in self._files + [self._gzip_file]:
+            try:
+                if f is not None:
+                    f.close()
+            except Exception:
+                pass
+        self._files = []
+        self._gzip_file = None
+        for filename in self.filenames:
+            if os.path.exists(filename + '.tmp'):
+                os.remove(filename + '.tmp')
+
+    def write(self, record):
+        if not self.ok:
+            return
+        try:
+            self._write(b',\n' if self.count else b'\n')
+            self._write(dump_json_bytes(record))
+            self.count += 1
+        except Exception as e:
+            self._fail(e)
+
+    def close(self):
+        """Finish the array and report the file size(s). Returns success."""
+        if not self.ok:
+            return False
+        try:
+            self._write(b'\n]\n')
+            for f in self._files:
+                f.close()
+            self._files = []
+            if self._gzip_file is not None:
+                self._gzip_file.close()
+                self._gzip_file = None
+            for filename in self.filenames:
+                os.replace(filename + '.tmp', filename)
+        except Exception as e:
+            self._fail(e)
+            return False
+
+        for filename in self.filenames:
+            size_mb = os.path.getsize(filename) / (1024 * 1024)
+            print(f"✅ Saved {filename}: {size_mb:.2f} MB ({self.count:,} records)")
+        return True
 
-    # Add language data
-    language_code = people_group.get('ROL3')
-    if language_code and language_code in lookups['languages']:
-        language = lookups['languages'][language_code]
-        enriched['language_data'] = {
-            'name': language.get('Language'),
-            'hub_country': language.get('HubCountry'),
-            'bible_status': language.get('BibleStatus'),
-            'bible_year': language.get('BibleYear'),
-            'nt_year': language.get('NTYear'),
-            'portions_year': language.get('PortionsYear'),
-            'has_jesus_film': language.get('HasJesusFilm'),
-            'has_audio_recordings': language.get('AudioRecordings'),
-            'status': language.get('Status'),
-            # Geographic enrichment fields from Glottolog
-            'latitude': language.get('latitude'),
-            'longitude': language.get('longitude'),
-            'glottocode': language.get('glottocode'),
-            'family_name': language.get('family_name'),
-            'family_id': language.get('family_id'),
-            'macroarea': language.get('macroarea')
-        }
+def create_full_enriched(datasets, lookups, full_writers, unreached_writers):
+    """
+    Create fully enriched dataset with all people groups.
 
-    return enriched
+    A single pass over the people groups: each record is enriched and
+    handed to every writer in full_writers, and unreached records
+    (LeastReached == 'Y') also go to unreached_writers. Nothing is
+    accumulated in memory beyond the writers' own batches.
 
-def create_full_enriched(datasets, lookups):
-    """Create fully enriched dataset with all people groups."""
+    Returns:
+        (enriched_count, unreached_count)
+    """
     print("\n" + "="*70)
     print("CREATING FULL ENRICHED DATASET")
     print("="*70)
 
-    people_groups = datasets['people_groups']
-    enriched_records = []
+    enriched_count = 0
+    unreached_count = 0
 
-    total = len(people_groups)
-    for i, pg in enumerate(people_groups):
+    for pg in datasets['people_groups']:
         enriched = enrich_people_group(pg, lookups)
-        enriched_records.append(enriched)
+        for writer in full_writers:
+            writer.write(enriched)
+        enriched_count += 1
 
-        # Progress indicator
-        if (i + 1) % 1000 == 0:
-            print(f"  Progress: {i+1:,}/{total:,} ({100*(i+1)/total:.1f}%)")
-
-    print(f"\n✅ Created {len(enriched_records):,} enriched records")
-    return enriched_records
+        if enriched.get('LeastReached') == 'Y':
+            for writer in unreached_writers:
+                writer.write(enriched)
+            unreached_count += 1
 
-def create_unreached_subset(enriched_records):
-    """Create subset with only unreached people groups."""
-    print("\n" + "="*70)
-    print("CREATING UNREACHED SUBSET")
-    print("="*70)
-
-    unreached = [r for r in enriched_records if r.get('LeastReached') == 'Y']
-
-    print(f"✅ Filtered to {len(unreached):,} unreached people groups")
-    print(f"   ({100*len(unreached)/len(enriched_records):.1f}% of total)")
+        # Progress indicator
+        if enriched_count % 1000 == 0:
+            print(f"  Progress: {enriched_count:,} records")
 
-    return unreached
+    print(f"\n✅ Created {enriched_count:,} enriched records")
+    print(f"✅ Filtered to {unreached_count:,} unreached people groups")
+    print(f"   ({100*unreached_count/enriched_count:.1f}% of total)")
+    return enriched_count, unreached_count
 
 def save_json(data, filename, description):
     """Save data to JSON file."""
     print(f"\nSaving {description} to {filename}...")
 
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(filename, 'wb') as f:
+            f.write(dump_json_bytes(data, indent=True))
 
         size_mb = os.path.getsize(filename) / (1024 * 1024)
         print(f"✅ Saved {size_mb:.2f} MB ({len(data):,} records)")
@@ -176,59 +413,337 @@ def save_json(data, filename, description):
         print(f"❌ Error saving: {e}")
         return False
 
-def save_parquet(data, filename, description):
-    """Save data to Parquet file."""
-    print(f"\nSaving {description} to {filename}...")
-
-    try:
-        import pyarrow as pa
-        import pyarrow.parquet as pq
-
-        # Convert to PyArrow table
-        table = pa.Table.from_pylist(data)
+def build_parquet_schema(pa, inferred):
+    """
+    Build the record schema for enriched records from an inferred schema.
+
+    People group columns keep the types pyarrow inferred for a batch
+    (columns that were all null stay null-typed, see parquet_file_schema);
+    country_data and language_data use the explicit struct layouts above.
+    """
+    struct_types = {
+        'country_data': pa.struct([(k, pa.type_for_alias(t)) for k, t in COUNTRY_DATA_TYPES.items()]),
+        'language_data': pa.struct([(k, pa.type_for_alias(t)) for k, t in LANGUAGE_DATA_TYPES.items()])
+    }
 
-        # Write with compression
-        pq.write_table(table, filename, compression='snappy')
+    fields = []
+    for field in inferred:
+        if field.name in struct_types:
+            field = pa.field(field.name, struct_types.pop(field.name))
+        fields.append(field)
+
+    # Sub-records missing from every sampled row still get a column
+    fields.extend(pa.field(name, struct_type) for name, struct_type in struct_types.items())
+    return pa.schema(fields)
+
+def parquet_file_schema(pa, schema):
+    """Schema as written to file: columns that only held nulls so far are strings."""
+    return pa.schema([pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+                      for field in schema])
+
+def conform_to_schema(pa, data, schema):
+    """Cast a RecordBatch or Table to schema; columns it lacks become all-null."""
+    names = set(data.schema.names)
+    columns = []
+    for field in schema:
+        if field.name in names:
+            column = data.column(field.name)
+            if column.type != field.type:
+                column = column.cast(field.type)
+        else:
+            column = pa.nulls(data.num_rows, field.type)
+        columns.append(column)
+    return type(data).from_arrays(columns, schema=schema)
+
+def parquet_column_encodings(pa, schema):
+    """
+    Choose per-column Parquet encodings for the enriched schema.
+
+    String and float leaves (including struct children such as
+    country_data.continent) are dictionary-encoded - continents, regions,
+    religions and language families repeat across thousands of rows, so
+    they collapse to small integer indices. Integer leaves (Population,
+    PeopleID3, ...) use DELTA_BINARY_PACKED instead.
+
+    Returns:
+        (dictionary_columns, column_encoding) for pq.ParquetWriter
+    """
+    dictionary_columns = []
+    column_encoding = {}
+
+    def visit(field, prefix):
+        path = prefix + field.name
+        if pa.types.is_struct(field.type):
+            for child in field.type:
+                visit(child, path + '.')
+        elif pa.types.is_integer(field.type):
+            column_encoding[path] = 'DELTA_BINARY_PACKED'
+        elif pa.types.is_string(field.type) or pa.types.is_floating(field.type):
+            dictionary_columns.append(path)
+
+    for field in schema:
+        visit(field, '')
+    return dictionary_columns, column_encoding
+
+class ParquetBatchWriter:
+    """
+    Stream records into a Parquet file in PARQUET_BATCH_SIZE RecordBatches.
+
+    Column types are inferred batch by batch (see build_parquet_schema). When
+    a later batch needs a wider type - a column that was all null so far, or
+    ints followed by floats - the schema is widened with pa.unify_schemas and
+    the rows already written are rewritten with it, so the file is typed as
+    if every record had been converted at once.
+
+    If arrow_filename is given, the same batches are also written to an
+    uncompressed Arrow IPC (Feather v2) file, which can be memory-mapped for
+    near-instant reloads (see data_utilities.load_arrow_mmap).
+
+    Subset writers registered with add_subset() are fed each batch filtered
+    column-wise with pyarrow.compute, so subset rows are never converted
+    from Python dicts a second time. Close the parent before its subsets.
+
+    Output goes to <filename>.tmp files that close() renames into place. If
+    pyarrow is missing or a write fails, the writer reports it once, removes
+    its partial files and is marked as failed.
+    """
+
+    def __init__(self, filename, description, arrow_filename=None):
+        self.filename = filename
+        self.description = description
+        self.arrow_filename = arrow_filename
+        self.filenames = [filename] + ([arrow_filename] if arrow_filename else [])
+        self.count = 0
+        self.ok = True
+        self._batch = []
+        self._types = None   # record schema; columns seen only as null are null-typed
+        self._schema = None  # schema of the file(s) being written
+        self._writer = None
+        self._arrow_writer = None
+        self._subsets = []
+        self._pending = []
+        self._pending_rows = 0
+        print(f"\nStreaming {description} to {', '.join(self.filenames)}...")
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            import pyarrow.parquet as pq
+        except ImportError:
+            print(f"⚠️  PyArrow not installed. Run: pip install pyarrow")
+            print(f"   Skipping Parquet export for {filename}")
+            self.ok = False
+            return
+        self._pa = pa
+        self._pc = pc
+        self._pq = pq
+
+    def add_subset(self, writer, column, value):
+        """Also send rows where column == value to another ParquetBatchWriter."""
+        self._subsets.append((writer, column, value))
+
+    def write(self, record):
+        if not self.ok:
+            return
+        self._batch.append(record)
+        if len(self._batch) >= PARQUET_BATCH_SIZE:
+            self._flush()
+
+    def _open(self):
+        pa = self._pa
+        dictionary_columns, column_encoding = parquet_column_encodings(pa, self._schema)
+        # zstd is smaller than snappy at similar decode speed
+        self._writer = self._pq.ParquetWriter(self.filename + '.tmp', self._schema,
+                                              compression='zstd', compression_level=3,
+                                              use_dictionary=dictionary_columns,
+                                              column_encoding=column_encoding)
+        if self.arrow_filename:
+            # Left uncompressed so memory-mapped reads stay zero-copy
+            self._arrow_writer = pa.ipc.new_file(self.arrow_filename + '.tmp', self._schema)
+
+    def _write_table(self, table, row_group_size):
+        self._writer.write_table(table, row_group_size=row_group_size)
+        if self._arrow_writer is not None:
+            self._arrow_writer.write_table(table)
+
+    def set_schema(self, schema):
+        """
+        Switch to a wider file schema.
+
+        Called when a batch needs wider types, and by a parent writer on its
+        subsets so they stay typed like the parent. Buffered batches are cast
+        to the new schema. Rows already written are read back from the
+        partial Parquet file and rewritten with it (the Arrow copy holds the
+        same rows, so it is rebuilt from the same table), which costs a full
+        pass over everything written so far. Each call widens at least one
+        column (null to a type, int to float, or a new column), so rewrites
+        are bounded by the number of columns, not the number of batches.
+        """
+        if not self.ok:
+            return
+        pa = self._pa
+        try:
+            self._schema = schema
+            self._pending = [conform_to_schema(pa, batch, schema) for batch in self._pending]
+            if self._writer is None:
+                return
+            print(f"  ↻ Widening schema of {self.filename}, rewriting {self.count:,} rows")
+            for writer in (self._writer, self._arrow_writer):
+                if writer is not None:
+                    writer.close()
+            written = self._pq.read_table(self.filename + '.tmp')
+            self._open()
+            self._write_table(conform_to_schema(pa, written, schema), PARQUET_BATCH_SIZE)
+        except Exception as e:
+            self._fail(e)
+
+    def _to_batch(self, rows):
+        """Convert rows to a RecordBatch, widening the schema if they need it."""
+        pa = self._pa
+        # pa.array infers over every row (RecordBatch.from_pylist only looks
+        # at the first row's keys)
+        inferred = pa.RecordBatch.from_struct_array(pa.array(rows))
+        types = build_parquet_schema(pa, inferred.schema)
+        if self._types is not None:
+            types = pa.unify_schemas([self._types, types], promote_options='permissive')
+        self._types = types
+
+        schema = parquet_file_schema(pa, types)
+        if schema != self._schema:
+            self.set_schema(schema)
+            for writer, _, _ in self._subsets:
+                writer.set_schema(schema)
+        return conform_to_schema(pa, inferred, schema)
+
+    def write_batch(self, batch):
+        """
+        Write an already-built RecordBatch (used for subsets).
+
+        Small filtered batches are held back until PARQUET_BATCH_SIZE rows
+        have accumulated, so subsets get row groups as large as the parent's.
+        """
+        if not self.ok:
+            return
+        if self._schema is None:
+            self._schema = batch.schema
+        self._pending.append(batch)
+        self._pending_rows += batch.num_rows
+        if self._pending_rows >= PARQUET_BATCH_SIZE:
+            self._write_pending()
+
+    def _write_pending(self):
+        try:
+            table = self._pa.Table.from_batches(self._pending, schema=self._schema)
+            if self._writer is None:
+                self._open()
+            self._write_table(table, max(table.num_rows, 1))
+            self.count += table.num_rows
+        except Exception as e:
+            self._fail(e)
+        self._pending = []
+        self._pending_rows = 0
+
+    def _flush(self):
+        rows = self._batch
+        self._batch = []
+        try:
+            batch = self._to_batch(rows)
+        except Exception as e:
+            self._fail(e)
+        if not self.ok:
+            for writer, _, _ in self._subsets:
+                if writer.ok:
+                    writer._fail(f"{self.filename} failed")
+            return
+
+        self.write_batch(batch)
+        for writer, column, value in self._subsets:
+            writer.write_batch(batch.filter(self._pc.equal(batch[column], value)))
+
+    def _fail(self, error):
+        """Report the error once and remove the partial .tmp files."""
+        print(f"❌ Error saving {self.filename}: {error}")
+        self.abort()
+
+    def abort(self):
+        """Stop writing and remove the partial .tmp files."""
+        self.ok = False
+        for writer in (self._writer, self._arrow_writer):
+            if writer is not None:
+                try:
+                    writer.close()
+                except Exception:
+                    pass
+        self._writer = self._arrow_writer = None
+        for filename in self.filenames:
+            if os.path.exists(filename + '.tmp'):
+                os.remove(filename + '.tmp')
+
+    def close(self):
+        """Flush the last batch and report the file size(s). Returns success."""
+        if self.ok and self._batch:
+            self._flush()
+        if self.ok and self._pending:
+            self._write_pending()
+        if self.ok and self._writer is None:
+            # No rows at all: still write an empty file. A subset already has
+            # its parent's schema; a schema is never built from an empty batch
+            # when one is known, since that would lack every people group column.
+            try:
+                if self._schema is None:
+                    pa = self._pa
+                    self._schema = parquet_file_schema(pa, build_parquet_schema(pa, pa.schema([])))
+                self._open()
+            except Exception as e:
+                self._fail(e)
+        if not self.ok:
+            return False
 
-        size_mb = os.path.getsize(filename) / (1024 * 1024)
-        print(f"✅ Saved {size_mb:.2f} MB ({len(data):,} records)")
+        try:
+            for writer in (self._writer, self._arrow_writer):
+                if writer is not None:
+                    writer.close()
+            self._writer = self._arrow_writer = None
+            for filename in self.filenames:
+                os.replace(filename + '.tmp', filename)
+        except Exception as e:
+            self._fail(e)
+            return False
+
+        for filename in self.filenames:
+            size_mb = os.path.getsize(filename) / (1024 * 1024)
+            print(f"✅ Saved {filename}: {size_mb:.2f} MB ({self.count:,} records)")
         return True
 
-    except ImportError:
-        print(f"⚠️  PyArrow not installed. Run: pip install pyarrow")
-        print(f"   Skipping Parquet export for {filename}")
-        return False
-    except Exception as e:
-        print(f"❌ Error saving: {e}")
-        return False
-
-def generate_enrichment_metadata(datasets, enriched, unreached):
+def generate_enrichment_metadata(source_counts, enriched_count, unreached_count):
     """Generate metadata about enrichment process."""
     metadata = {
         "generated_at": datetime.now().isoformat(),
         "source_datasets": {
-            "people_groups": len(datasets['people_groups']),
-            "countries": len(datasets['countries']),
-            "languages": len(datasets['languages']),
-            "totals": len(datasets['totals'])
+            "people_groups": enriched_count,
+            "countries": source_counts['countries'],
+            "languages": source_counts['languages'],
+            "totals": source_counts['totals']
         },
         "enriched_datasets": {
             "full_enriched": {
-                "records": len(enriched),
+                "records": enriched_count,
                 "json_file": "joshua_project_enriched.json",
-                "parquet_file": "joshua_project_enriched.parquet"
+                "json_gz_file": "joshua_project_enriched.json.gz",
+                "parquet_file": "joshua_project_enriched.parquet",
+                "arrow_file": "joshua_project_enriched.arrow"
             },
             "unreached_only": {
-                "records": len(unreached),
+                "records": unreached_count,
                 "json_file": "joshua_project_unreached.json",
+                "json_gz_file": "joshua_project_unreached.json.gz",
                 "parquet_file": "joshua_project_unreached.parquet",
-                "percentage_of_total": round(100 * len(unreached) / len(enriched), 2)
+                "percentage_of_total": round(100 * unreached_count / enriched_count, 2)
             }
         },
         "enrichment_details": {
             "added_fields": [
-                "country_data (9 fields)",
-                "language_data (9 fields)"
+                f"country_data ({len(COUNTRY_DATA_FIELDS)} fields)",
+                f"language_data ({len(LANGUAGE_DATA_FIELDS)} fields)"
             ],
             "original_fields_per_record": 107,
             "enriched_fields_per_record": 109  # 107 + country_data + language_data
@@ -243,35 +758,62 @@ def main():
     print("JOSHUA PROJECT DATA ENRICHMENT PIPELINE")
     print("="*70)
 
-    # Load datasets
-    datasets = load_datasets()
+    # Reuse cached reference lookups when their inputs are unchanged
+    cache_path = lookup_cache_path()
+    cached = load_lookup_cache(cache_path)
+
+    # Load datasets (people groups are always streamed fresh)
+    datasets = load_datasets(['people_groups'] if cached else None)
     if not datasets:
         print("\n❌ Failed to load datasets. Exiting.")
         return
 
     # Create lookups
-    lookups = create_lookups(datasets)
+    if cached:
+        lookups, source_counts = cached
+    else:
+        lookups = create_lookups(datasets)
+        source_counts = {name: len(datasets[name]) for name in LOOKUP_DATASETS}
+        save_lookup_cache(cache_path, lookups, source_counts)
+
+    # Open all outputs up front; records are streamed into them in one pass.
+    # The unreached Parquet file is filtered from the full file's batches,
+    # so it must close after full_parquet (dict order below).
+    writers = {
+        'full_json': JsonArrayWriter('joshua_project_enriched.json', 'full enriched dataset', gzip=True),
+        'full_parquet': ParquetBatchWriter('joshua_project_enriched.parquet', 'full enriched dataset',
+                                           arrow_filename='joshua_project_enriched.arrow'),
+        'unreached_json': JsonArrayWriter('joshua_project_unreached.json', 'unreached subset', gzip=True),
+        'unreached_parquet': ParquetBatchWriter('joshua_project_unreached.parquet', 'unreached subset')
+    }
 
-    # Create full enriched dataset
-    enriched = create_full_enriched(datasets, lookups)
+    writers['full_parquet'].add_subset(writers['unreached_parquet'], 'LeastReached', 'Y')
 
-    # Create unreached subset
-    unreached = create_unreached_subset(enriched)
+    # Create full enriched dataset and unreached subset. The people groups
+    # are parsed as they stream, so a malformed dump only shows up here;
+    # the partial outputs are discarded.
+    try:
+        enriched_count, unreached_count = create_full_enriched(
+            datasets, lookups,
+            [writers['full_json'], writers['full_parquet']],
+            [writers['unreached_json']]
+        )
+    except ValueError as e:
+        print(f"\n  ❌ JSON error in {DATASET_FILES['people_groups']}: {e}")
+        for writer in writers.values():
+            writer.abort()
+        print("\n❌ Failed to load datasets. Exiting.")
+        return
 
     # Save outputs
     print("\n" + "="*70)
     print("SAVING ENRICHED DATASETS")
     print("="*70)
 
-    results = {
-        'full_json': save_json(enriched, 'joshua_project_enriched.json', 'full enriched dataset'),
-        'full_parquet': save_parquet(enriched, 'joshua_project_enriched.parquet', 'full enriched dataset'),
-        'unreached_json': save_json(unreached, 'joshua_project_unreached.json', 'unreached subset'),
-        'unreached_parquet': save_parquet(unreached, 'joshua_project_unreached.parquet', 'unreached subset')
-    }
+    results = {name: writer.close() for name, writer in writers.items()}
 
     # Generate and save metadata
-    metadata = generate_enrichment_metadata(datasets, enriched, unreached)
+    metadata = generate_enrichment_metadata(source_counts, enriched_count, unreached_count)
     save_json(metadata, 'enriched_metadata.json', 'enrichment metadata')
 
     # Print summary
@@ -285,8 +827,8 @@ def main():
         status = "✅" if success else "❌"
         print(f"  {status} {name}")
 
-    print(f"\nEnriched records: {len(enriched):,}")
-    print(f"Unreached subset: {len(unreached):,} ({100*len(unreached)/len(enriched):.1f}%)")
+    print(f"\nEnriched records: {enriched_count:,}")
+    print(f"Unreached subset: {unreached_count:,} ({100*unreached_count/enriched_count:.1f}%)")
 
     if results['full_parquet']:
         json_size = os.path.getsize('joshua_project_enriched.json') / (1024 * 1024)
@@ -14,15 +14,36 @@ Usage examples:
     >>> import pandas as pd
     >>> df = pd.read_parquet(load_parquet('enriched'))
 
+    # For fast columnar filtering (pyarrow)
+    >>> from data_utilities import load_arrow, query_arrow, filter_unreached
+    >>> unreached = filter_unreached(load_arrow('enriched'))
+    >>> india_tbl = query_arrow('ROG3', 'IN')
+
+    # For repeated reloads (memory-mapped Arrow IPC, zero-copy)
+    >>> from data_utilities import load_arrow_mmap
+    >>> tbl = load_arrow_mmap()
+
     # For specific queries
     >>> from data_utilities import get_by_country
     >>> india_peoples = get_by_country('IN')
 """
 
+import collections
+import copy
+import functools
+import gzip
+import importlib
 import json
+import mmap
 import os
+import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib parser
+    orjson = None
+
 # Dataset file paths
 DATASET_DIR = Path(__file__).parent
 
@@ -35,19 +56,82 @@ FILES = {
     'unreached': DATASET_DIR / 'joshua_project_unreached.json',
     'enriched_parquet': DATASET_DIR / 'joshua_project_enriched.parquet',
     'unreached_parquet': DATASET_DIR / 'joshua_project_unreached.parquet',
+    'enriched_arrow': DATASET_DIR / 'joshua_project_enriched.arrow',
 }
 
-def load_json(dataset_name):
+# JSON helpers shared by the pipeline scripts
+
+def dump_json_bytes(data, indent=False):
     """
-    Load a JSON dataset by name.
+    Serialize data as UTF-8 JSON bytes (orjson when available).
 
-    Args:
-        dataset_name: One of 'people_groups', 'countries', 'languages',
-                     'totals', 'enriched', 'unreached'
+    Minified by default; indent=True gives 2-space indentation. Non-string
+    dict keys (e.g. None) are written as strings, as json.dumps does.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def open_gzip_writer(fileobj, compresslevel, name=''):
+    """
+    Open a gzip stream that compresses into fileobj (a binary file).
 
-    Returns:
-        Parsed JSON data (list or dict)
+    The header mtime is fixed at 0, so the same input always gives the same
+    .gz bytes. name is the file name recorded in the header - pass the final
+    name when fileobj is a temporary file that is renamed into place later.
+    """
+    return gzip.GzipFile(name, 'wb', compresslevel=compresslevel, fileobj=fileobj, mtime=0)
+
+def iter_json_array(filename):
     """
+    Yield the items of a top-level JSON array one at a time.
+
+    Uses ijson when available so the array is never fully materialized.
+    Otherwise the whole file is parsed: by orjson straight from a read-only
+    mmap (the raw bytes are never copied), or by the stdlib parser. On every
+    path a top-level value that is not an array yields nothing, and empty or
+    malformed input raises ValueError - possibly after some items have
+    already been yielded.
+    """
+    try:
+        import ijson
+    except ImportError:
+        with open(filename, 'rb') as f:
+            # mmap refuses empty files with an unhelpful error; say what is wrong
+            if os.fstat(f.fileno()).st_size == 0:
+                raise ValueError(f"{filename} is empty; expected a JSON array")
+            if orjson is None:
+                items = json.loads(f.read())
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    items = orjson.loads(view)
+        if isinstance(items, list):
+            yield from items
+        return
+
+    with open(filename, 'rb') as f:
+        try:
+            yield from ijson.items(f, 'item', use_float=True)
+        except ijson.JSONError as e:
+            raise ValueError(f"invalid JSON: {e}") from e
+
+def intern_label(value):
+    """
+    Intern a repeated label (bloc, religion, country, continent, family...).
+
+    Each parsed copy of e.g. 'Asia' is a separate string object; interning
+    makes every record with the same label share one. Anything that is not
+    exactly a str (None, NaN, numbers) passes through - sys.intern also
+    rejects str subclasses.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+@functools.lru_cache(maxsize=None)
+def _load_json_cached(dataset_name):
+    """Parse a JSON dataset once per process; later calls hit the cache."""
     if dataset_name not in FILES:
         raise ValueError(f"Unknown dataset: {dataset_name}")
 
@@ -56,9 +140,63 @@ def load_json(dataset_name):
     if not filepath.exists():
         raise FileNotFoundError(f"Dataset not found: {filepath}")
 
+    if orjson is not None:
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+def load_json(dataset_name):
+    """
+    Load a JSON dataset by name.
+
+    Each file is parsed once per process and served from memory afterwards.
+    The returned list/dict is a shallow copy, so adding or removing items is
+    safe, but the records inside are shared between calls - copy a record
+    before modifying it.
+
+    Args:
+        dataset_name: One of 'people_groups', 'countries', 'languages',
+                     'totals', 'enriched', 'unreached'
+
+    Returns:
+        Parsed JSON data (list or dict)
+    """
+    return copy.copy(_load_json_cached(dataset_name))
+
+@functools.lru_cache(maxsize=None)
+def _index_by(dataset_name, key):
+    """
+    Map key -> record for a dataset (first record wins on duplicates).
+
+    The records are the cached parsed objects themselves, not copies.
+    """
+    index = {}
+    for record in _load_json_cached(dataset_name):
+        index.setdefault(record[key], record)
+    return index
+
+@functools.lru_cache(maxsize=None)
+def _group_by(dataset_name, key):
+    """
+    Map key -> list of records for a dataset, in file order.
+
+    The records are the cached parsed objects themselves, not copies.
+    """
+    groups = collections.defaultdict(list)
+    for record in _load_json_cached(dataset_name):
+        groups[record.get(key)].append(record)
+    return dict(groups)
+
+def clear_cache():
+    """Drop cached datasets, e.g. after regenerating files on disk."""
+    _load_json_cached.cache_clear()
+    _index_by.cache_clear()
+    _group_by.cache_clear()
+    load_arrow.cache_clear()
+    load_arrow_mmap.cache_clear()
+
 def load_normalized():
     """
     Load all normalized datasets.
@@ -77,6 +215,10 @@ def load_enriched():
     """
     Load the enriched dataset (people groups with embedded country/language data).
 
+    This is the slow path: it builds ~17k Python dicts of ~109 fields each.
+    For filtering and aggregation prefer load_arrow() / query_arrow(), which
+    only touch the columns involved.
+
     Returns:
         list of enriched people group records
     """
@@ -117,6 +259,81 @@ def load_parquet(dataset_name='enriched'):
 
     return filepath
 
+def _import_pyarrow(module, caller):
+    """Import a pyarrow module, or raise an ImportError naming caller."""
+    try:
+        return importlib.import_module(module)
+    except ImportError:
+        raise ImportError(f"{caller} requires pyarrow. Run: pip install pyarrow") from None
+
+@functools.lru_cache(maxsize=None)
+def load_arrow(dataset_name='enriched'):
+    """
+    Load a Parquet dataset as a pyarrow Table.
+
+    Tables are immutable, so the cached Table is shared between calls.
+    Filter with pyarrow.compute, or hand off via .to_pandas() / polars.
+
+    Args:
+        dataset_name: 'enriched' or 'unreached'
+
+    Returns:
+        pyarrow.Table
+
+    Example:
+        >>> import pyarrow.compute as pc
+        >>> tbl = load_arrow('enriched')
+        >>> islam = tbl.filter(pc.equal(tbl['PrimaryReligion'], 'Islam'))
+    """
+    pq = _import_pyarrow('pyarrow.parquet', 'load_arrow')
+
+    return pq.read_table(load_parquet(dataset_name))
+
+@functools.lru_cache(maxsize=None)
+def load_arrow_mmap(dataset_name='enriched'):
+    """
+    Memory-map an Arrow IPC dataset as a pyarrow Table.
+
+    Unlike load_arrow, nothing is decoded up front: column buffers point
+    straight into the mapped file and the OS pages in only what is touched.
+
+    Args:
+        dataset_name: 'enriched'
+
+    Returns:
+        pyarrow.Table
+
+    Example:
+        >>> tbl = load_arrow_mmap()
+        >>> filter_unreached(tbl).num_rows
+    """
+    pa = _import_pyarrow('pyarrow', 'load_arrow_mmap')
+
+    arrow_key = f'{dataset_name}_arrow'
+    if arrow_key not in FILES:
+        raise ValueError(f"Unknown arrow dataset: {dataset_name}")
+
+    filepath = FILES[arrow_key]
+    if not filepath.exists():
+        raise FileNotFoundError(f"Arrow file not found: {filepath}")
+
+    return pa.ipc.open_file(pa.memory_map(str(filepath), 'r')).read_all()
+
+def query_arrow(column, value, dataset_name='enriched'):
+    """
+    Get the rows of a Parquet dataset where column == value.
+
+    Columnar equivalent of get_by_country / get_by_language /
+    get_by_religion, e.g. query_arrow('ROG3', 'IN').
+
+    Returns:
+        pyarrow.Table of matching rows
+    """
+    pc = _import_pyarrow('pyarrow.compute', 'query_arrow')
+
+    tbl = load_arrow(dataset_name)
+    return tbl.filter(pc.equal(tbl[column], value))
+
 def get_by_country(country_code, enriched=True):
     """
     Get all people groups in a specific country.
@@ -126,10 +343,12 @@ def get_by_country(country_code, enriched=True):
         enriched: If True, use enriched dataset; if False, use normalized
 
     Returns:
-        list of people group records for that country
+        list of people group records for that country. The list is new,
+        but the records are shared with the in-process cache - copy a
+        record before modifying it.
     """
-    dataset = load_enriched() if enriched else load_json('people_groups')
-    return [p for p in dataset if p.get('ROG3') == country_code]
+    dataset_name = 'enriched' if enriched else 'people_groups'
+    return list(_group_by(dataset_name, 'ROG3').get(country_code, []))
 
 def get_by_language(language_code, enriched=True):
     """
@@ -140,10 +359,12 @@ def get_by_language(language_code, enriched=True):
         enriched: If True, use enriched dataset; if False, use normalized
 
     Returns:
-        list of people group records speaking that language
+        list of people group records speaking that language. The list is
+        new, but the records are shared with the in-process cache - copy a
+        record before modifying it.
     """
-    dataset = load_enriched() if enriched else load_json('people_groups')
-    return [p for p in dataset if p.get('ROL3') == language_code]
+    dataset_name = 'enriched' if enriched else 'people_groups'
+    return list(_group_by(dataset_name, 'ROL3').get(language_code, []))
 
 def get_by_religion(religion, enriched=True):
     """
@@ -154,24 +375,33 @@ def get_by_religion(religion, enriched=True):
         enriched: If True, use enriched dataset; if False, use normalized
 
     Returns:
-        list of people group records with that primary religion
+        list of people group records with that primary religion. The list
+        is new, but the records are shared with the in-process cache - copy
+        a record before modifying it.
     """
-    dataset = load_enriched() if enriched else load_json('people_groups')
-    return [p for p in dataset if p.get('PrimaryReligion') == religion]
+    dataset_name = 'enriched' if enriched else 'people_groups'
+    return list(_group_by(dataset_name, 'PrimaryReligion').get(religion, []))
 
 def filter_unreached(data=None):
     """
     Filter dataset to only unreached people groups.
 
     Args:
-        data: Dataset to filter (if None, loads enriched dataset)
+        data: Dataset to filter (if None, loads enriched dataset). May also
+              be a pyarrow.Table from load_arrow(), which is filtered
+              column-wise.
 
     Returns:
-        list of unreached people group records
+        list of unreached people group records (or a pyarrow.Table when
+        given one)
     """
     if data is None:
         data = load_enriched()
 
+    if hasattr(data, 'column_names'):
+        pc = _import_pyarrow('pyarrow.compute', 'filter_unreached')
+        return data.filter(pc.equal(data['LeastReached'], 'Y'))
+
     return [p for p in data if p.get('LeastReached') == 'Y']
 
 def get_totals():
@@ -192,13 +422,10 @@ def get_country_info(country_code):
         country_code: 3-letter country code (ROG3)
 
     Returns:
-        dict with country data, or None if not found
+        dict with country data, or None if not found. The dict is shared
+        with the in-process cache - copy it before modifying it.
     """
-    countries = load_json('countries')
-    for country in countries:
-        if country['ROG3'] == country_code:
-            return country
-    return None
+    return _index_by('countries', 'ROG3').get(country_code)
 
 def get_language_info(language_code):
     """
@@ -208,13 +435,10 @@ def get_language_info(language_code):
         language_code: 3-letter language code (ROL3)
 
     Returns:
-        dict with language data, or None if not found
+        dict with language data, or None if not found. The dict is shared
+        with the in-process cache - copy it before modifying it.
     """
-    languages = load_json('languages')
-    for language in languages:
-        if language['ROL3'] == language_code:
-            return language
-    return None
+    return _index_by('languages', 'ROL3').get(language_code)
 
 # Example usage and tests
 if __name__ == "__main__":
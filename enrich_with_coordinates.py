@@ -13,8 +13,8 @@ Usage:
     python3 enrich_with_coordinates.py
 
 Output:
-    - joshua_project_enriched_geo.json
-    - joshua_project_languages_enriched_geo.json
+    - joshua_project_enriched_geo.json (+ .json.gz)
+    - joshua_project_languages_enriched_geo.json (+ .json.gz)
     - enrichment_metadata.json
 """
 
@@ -24,12 +24,57 @@ import numpy as np
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
+
+from data_utilities import dump_json_bytes, intern_label, open_gzip_writer
+
 # Configuration
 BASE_DIR = Path(__file__).parent.parent
 JOSHUA_DIR = Path(__file__).parent
 GEOGRAPHIC_DIR = BASE_DIR / 'data' / 'geographic'
 LINGUISTIC_DIR = BASE_DIR / 'data' / 'linguistic'
 
+# glottolog_languoid.csv columns needed for the family lookups
+LANGUOID_COLUMNS = ['id', 'name', 'level', 'family_id']
+
+# Fields added by each enrichment step
+PEOPLE_GROUP_GEO_FIELDS = ['country_latitude', 'country_longitude', 'continent', 'region_un', 'coordinate_source']
+LANGUAGE_GEO_FIELDS = ['latitude', 'longitude', 'glottocode', 'family_name', 'family_id', 'macroarea', 'coordinate_source', 'glottolog_match_count']
+
+def save_json_with_gzip(path, data):
+    """
+    Write data as compact JSON plus a gzip copy at <path>.gz.
+
+    Level 1 gzip is nearly free next to serialization and still shrinks the
+    repetitive record JSON several times over. Returns (json_size, gz_size)
+    in bytes.
+    """
+    payload = dump_json_bytes(data)
+    path.write_bytes(payload)
+    with open(f'{path}.gz', 'wb') as f:
+        with open_gzip_writer(f, 1) as gz:
+            gz.write(payload)
+        return len(payload), f.tell()
+
+def load_json(path):
+    """
+    Parse a JSON file (orjson when available).
+
+    Files exported from pandas may contain bare NaN tokens, which orjson
+    rejects; those fall back to the stdlib parser.
+    """
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
 def load_data():
     """Load all required datasets."""
     print("=" * 70)
@@ -38,36 +83,31 @@ def load_data():
     print("\n📂 Loading datasets...")
 
     # Load Joshua Project data
-    with open(JOSHUA_DIR / 'joshua_project_full_dump.json') as f:
-        people_groups = json.load(f)
+    people_groups = load_json(JOSHUA_DIR / 'joshua_project_full_dump.json')
     print(f"   ✓ Loaded {len(people_groups):,} people groups")
 
-    with open(JOSHUA_DIR / 'joshua_project_languages.json') as f:
-        languages = json.load(f)
+    languages = load_json(JOSHUA_DIR / 'joshua_project_languages.json')
     print(f"   ✓ Loaded {len(languages):,} languages")
 
-    with open(JOSHUA_DIR / 'joshua_project_countries.json') as f:
-        countries_jp = json.load(f)
+    countries_jp = load_json(JOSHUA_DIR / 'joshua_project_countries.json')
     print(f"   ✓ Loaded {len(countries_jp):,} countries (Joshua Project)")
 
     # Load geographic data
-    with open(GEOGRAPHIC_DIR / 'country_centroids.json') as f:
-        centroids = json.load(f)
+    centroids = load_json(GEOGRAPHIC_DIR / 'country_centroids.json')
     print(f"   ✓ Loaded {len(centroids):,} country centroids (Natural Earth)")
 
     # Load Glottolog coordinates
-    with open(LINGUISTIC_DIR / 'glottolog_coordinates.json') as f:
-        glottolog = json.load(f)
+    glottolog = load_json(LINGUISTIC_DIR / 'glottolog_coordinates.json')
     print(f"   ✓ Loaded {len(glottolog):,} language coordinates (Glottolog)")
 
     # Load Glottolog languoid data for family lookup
     glottolog_languoid_path = LINGUISTIC_DIR / 'glottolog_languoid.csv'
-    glottolog_languoid = pd.read_csv(glottolog_languoid_path)
+    # Only the columns build_lookup_tables uses; ids and names stay strings
+    glottolog_languoid = pd.read_csv(glottolog_languoid_path, usecols=LANGUOID_COLUMNS, dtype=str)
     print(f"   ✓ Loaded {len(glottolog_languoid):,} Glottolog languoid entries")
 
     # Load ISO 639-3 codes for reference
-    with open(LINGUISTIC_DIR / 'iso_639_3.json') as f:
-        iso_codes = json.load(f)
+    iso_codes = load_json(LINGUISTIC_DIR / 'iso_639_3.json')
     print(f"   ✓ Loaded {len(iso_codes):,} ISO 639-3 language codes")
 
     return people_groups, languages, countries_jp, centroids, glottolog, glottolog_languoid, iso_codes
@@ -88,7 +128,10 @@ def build_lookup_tables(centroids, glottolog, glottolog_languoid):
 
     print(f"   ✓ Indexed {len(centroid_lookup)} country codes")
 
-    # Glottolog by ISO code (one-to-many - language can have multiple dialects)
+    # Glottolog by ISO code → (first entry, match count). Only the first entry
+    # (usually the main language) is used, but a code can have several dialects.
+    # Kept as a plain loop: a pandas split/explode/groupby over the same
+    # entries is several times slower than this at Glottolog's size.
     glottolog_lookup = {}
     for lang in glottolog:
         iso_codes = str(lang.get('isocodes', '')).strip()
@@ -97,21 +140,18 @@ def build_lookup_tables(centroids, glottolog, glottolog_languoid):
             for code in iso_codes.split(','):
                 code = code.strip()
                 if code:
-                    if code not in glottolog_lookup:
-                        glottolog_lookup[code] = []
-                    glottolog_lookup[code].append(lang)
+                    first, count = glottolog_lookup.get(code, (lang, 0))
+                    glottolog_lookup[code] = (first, count + 1)
 
     print(f"   ✓ Indexed {len(glottolog_lookup)} ISO language codes")
 
     # Build family lookup dictionaries from glottolog_languoid
-    family_lookup = {}  # family_id → family_name
-    glottocode_to_family = {}  # glottocode → family_id
+    # (boolean masks + zip over columns instead of iterrows)
+    families = glottolog_languoid[glottolog_languoid['level'] == 'family']
+    family_lookup = dict(zip(families['id'], families['name']))  # family_id → family_name
 
-    for _, row in glottolog_languoid.iterrows():
-        if row['level'] == 'family':
-            family_lookup[row['id']] = row['name']
-        if pd.notna(row['family_id']):
-            glottocode_to_family[row['id']] = row['family_id']
+    has_family = glottolog_languoid[glottolog_languoid['family_id'].notna()]
+    glottocode_to_family = dict(zip(has_family['id'], has_family['family_id']))  # glottocode → family_id
 
     print(f"   ✓ Indexed {len(family_lookup)} language families")
     print(f"   ✓ Mapped {len(glottocode_to_family)} glottocodes to families")
@@ -119,37 +159,52 @@ def build_lookup_tables(centroids, glottolog, glottolog_languoid):
     return centroid_lookup, glottolog_lookup, family_lookup, glottocode_to_family
 
 def enrich_people_groups(people_groups, centroid_lookup):
-    """Enrich people groups with country centroids."""
+    """
+    Enrich people groups with country centroids.
+
+    Records are updated in place (main() does not reuse the originals).
+
+    Returns:
+        (people_groups, with_coords) - the same list, and how many records
+        got a non-empty country latitude
+    """
     print("\n🌍 Enriching people groups with coordinates...")
 
-    enriched = []
+    no_centroid = dict.fromkeys(PEOPLE_GROUP_GEO_FIELDS)
+
+    def centroid_fields(country_code):
+        centroid = centroid_lookup.get(country_code)
+        if centroid is None:
+            return no_centroid
+        return {
+            'country_latitude': centroid['latitude'],
+            'country_longitude': centroid['longitude'],
+            'continent': intern_label(centroid.get('continent', '')),
+            'region_un': intern_label(centroid.get('region_un', '')),
+            'coordinate_source': 'Natural Earth (country centroid)'
+        }
+
+    # Join table: country code → the fields added to each people group.
+    # ~240 distinct codes cover ~16k people groups, so each code is resolved
+    # the first time it is seen and the result is shared by every record.
+    resolved = {}
     matched = 0
-    unmatched_countries = set()
+    with_coords = 0
 
     for pg in people_groups:
-        pg_enriched = pg.copy()
-
         # Get country code (ROG3 is 3-letter ISO code)
         country_code = pg.get('ROG3', '')
+        fields = resolved.get(country_code)
+        if fields is None:
+            fields = resolved[country_code] = centroid_fields(country_code)
 
-        if country_code in centroid_lookup:
-            centroid = centroid_lookup[country_code]
-            pg_enriched['country_latitude'] = centroid['latitude']
-            pg_enriched['country_longitude'] = centroid['longitude']
-            pg_enriched['continent'] = centroid.get('continent', '')
-            pg_enriched['region_un'] = centroid.get('region_un', '')
-            pg_enriched['coordinate_source'] = 'Natural Earth (country centroid)'
+        if fields is not no_centroid:
             matched += 1
-        else:
-            pg_enriched['country_latitude'] = None
-            pg_enriched['country_longitude'] = None
-            pg_enriched['continent'] = None
-            pg_enriched['region_un'] = None
-            pg_enriched['coordinate_source'] = None
-            if country_code:
-                unmatched_countries.add(country_code)
+            if fields['country_latitude']:
+                with_coords += 1
+        pg.update(fields)
 
-        enriched.append(pg_enriched)
+    unmatched_countries = {code for code, fields in resolved.items() if fields is no_centroid and code}
 
     match_rate = 100 * matched / len(people_groups)
     print(f"   ✓ Matched {matched:,} / {len(people_groups):,} ({match_rate:.1f}%)")
@@ -157,68 +212,76 @@ def enrich_people_groups(people_groups, centroid_lookup):
     if unmatched_countries:
         print(f"   ⚠ {len(unmatched_countries)} unmatched country codes: {sorted(unmatched_countries)[:10]}")
 
-    return enriched
+    return people_groups, with_coords
+
+def glottolog_fields(glotto, match_count, family_lookup, glottocode_to_family):
+    """Fields added to a language whose first Glottolog match is glotto."""
+    # Convert NaN to None for proper JSON null
+    lat = glotto.get('latitude')
+    lng = glotto.get('longitude')
+    glottocode = glotto.get('glottocode', '')
+
+    # Get family name via 2-step lookup: glottocode → family_id → family_name
+    if glottocode and glottocode in glottocode_to_family:
+        family_id = glottocode_to_family[glottocode]
+        family_name = family_lookup.get(family_id, '')
+    # Fallback: check if this IS a family-level entry
+    elif glottocode and glottocode in family_lookup:
+        family_id = glottocode
+        family_name = family_lookup[glottocode]
+    else:
+        family_id = ''
+        family_name = 'Isolate' if glottocode else ''
+
+    return {
+        'latitude': None if pd.isna(lat) else lat,
+        'longitude': None if pd.isna(lng) else lng,
+        'glottocode': glottocode,
+        'family_name': intern_label(family_name),
+        'family_id': intern_label(family_id),
+        'macroarea': intern_label(glotto.get('macroarea', '')),
+        'coordinate_source': 'Glottolog',
+        'glottolog_match_count': match_count
+    }
 
 def enrich_languages(languages, glottolog_lookup, family_lookup, glottocode_to_family):
-    """Enrich Joshua Project languages with Glottolog coordinates."""
+    """
+    Enrich Joshua Project languages with Glottolog coordinates.
+
+    Records are updated in place.
+
+    Returns:
+        (languages, with_coords) - the same list, and how many records got
+        a non-empty latitude
+    """
     print("\n🗣️ Enriching languages with coordinates...")
 
-    enriched = []
+    no_match = {**dict.fromkeys(LANGUAGE_GEO_FIELDS), 'glottolog_match_count': 0}
+
+    # Join table: ISO code → the fields added to each language. Each code is
+    # resolved (NaN handling, family lookups) the first time it is seen;
+    # misses cache the shared no_match dict.
+    resolved = {}
     matched = 0
-    unmatched_iso_codes = set()
+    with_coords = 0
 
     for lang in languages:
-        lang_enriched = lang.copy()
-
         # Get ISO 639-3 code (ROL3)
         iso_code = lang.get('ROL3', '')
-
-        if iso_code and iso_code in glottolog_lookup:
-            # Get first Glottolog entry (usually the main language)
-            glotto_entries = glottolog_lookup[iso_code]
-            glotto = glotto_entries[0]  # Take first match
-
-            # Convert NaN to None for proper JSON null
-            lat = glotto.get('latitude')
-            lng = glotto.get('longitude')
-            lang_enriched['latitude'] = None if pd.isna(lat) else lat
-            lang_enriched['longitude'] = None if pd.isna(lng) else lng
-
-            glottocode = glotto.get('glottocode', '')
-            lang_enriched['glottocode'] = glottocode
-
-            # Get family name via 2-step lookup: glottocode → family_id → family_name
-            if glottocode and glottocode in glottocode_to_family:
-                family_id = glottocode_to_family[glottocode]
-                family_name = family_lookup.get(family_id, '')
-                lang_enriched['family_name'] = family_name
-                lang_enriched['family_id'] = family_id
-            else:
-                # Fallback: check if this IS a family-level entry
-                if glottocode and glottocode in family_lookup:
-                    lang_enriched['family_name'] = family_lookup[glottocode]
-                    lang_enriched['family_id'] = glottocode
-                else:
-                    lang_enriched['family_name'] = 'Isolate' if glottocode else ''
-                    lang_enriched['family_id'] = ''
-
-            lang_enriched['macroarea'] = glotto.get('macroarea', '')
-            lang_enriched['coordinate_source'] = 'Glottolog'
-            lang_enriched['glottolog_match_count'] = len(glotto_entries)
+        fields = resolved.get(iso_code)
+        if fields is None:
+            entry = glottolog_lookup.get(iso_code)
+            fields = resolved[iso_code] = (
+                glottolog_fields(*entry, family_lookup, glottocode_to_family) if entry else no_match
+            )
+
+        if fields is not no_match:
             matched += 1
-        else:
-            lang_enriched['latitude'] = None
-            lang_enriched['longitude'] = None
-            lang_enriched['glottocode'] = None
-            lang_enriched['family_name'] = None
-            lang_enriched['family_id'] = None
-            lang_enriched['macroarea'] = None
-            lang_enriched['coordinate_source'] = None
-            lang_enriched['glottolog_match_count'] = 0
-            if iso_code:
-                unmatched_iso_codes.add(iso_code)
-
-        enriched.append(lang_enriched)
+            if fields['latitude']:
+                with_coords += 1
+        lang.update(fields)
+
+    unmatched_iso_codes = {code for code, fields in resolved.items() if fields is no_match and code}
 
     match_rate = 100 * matched / len(languages)
     print(f"   ✓ Matched {matched:,} / {len(languages):,} ({match_rate:.1f}%)")
@@ -226,33 +289,25 @@ def enrich_languages(languages, glottolog_lookup, family_lookup, glottocode_to_f
     if unmatched_iso_codes:
         print(f"   ⚠ {len(unmatched_iso_codes)} unmatched ISO codes (sample): {sorted(unmatched_iso_codes)[:10]}")
 
-    return enriched
+    return languages, with_coords
 
-def save_enriched_data(people_groups_enriched, languages_enriched):
-    """Save enriched datasets."""
+def save_enriched_data(people_groups_enriched, pg_with_coords, languages_enriched, lang_with_coords):
+    """Save enriched datasets (coordinate counts come from the enrichment pass)."""
     print("\n💾 Saving enriched datasets...")
 
     # Save people groups
     pg_file = JOSHUA_DIR / 'joshua_project_enriched_geo.json'
-    with open(pg_file, 'w', encoding='utf-8') as f:
-        json.dump(people_groups_enriched, f, indent=2, ensure_ascii=False)
+    json_size, gz_size = save_json_with_gzip(pg_file, people_groups_enriched)
 
-    file_size_mb = pg_file.stat().st_size / (1024 * 1024)
-    print(f"   ✓ People groups: {pg_file}")
-    print(f"     Size: {file_size_mb:.1f} MB")
+    print(f"   ✓ People groups: {pg_file} (+ .gz)")
+    print(f"     Size: {json_size / (1024 * 1024):.1f} MB ({gz_size / (1024 * 1024):.1f} MB gzipped)")
 
     # Save languages
     lang_file = JOSHUA_DIR / 'joshua_project_languages_enriched_geo.json'
-    with open(lang_file, 'w', encoding='utf-8') as f:
-        json.dump(languages_enriched, f, indent=2, ensure_ascii=False)
-
-    file_size_mb = lang_file.stat().st_size / (1024 * 1024)
-    print(f"   ✓ Languages: {lang_file}")
-    print(f"     Size: {file_size_mb:.1f} MB")
+    json_size, gz_size = save_json_with_gzip(lang_file, languages_enriched)
 
-    # Count coordinates
-    pg_with_coords = sum(1 for pg in people_groups_enriched if pg.get('country_latitude'))
-    lang_with_coords = sum(1 for lang in languages_enriched if lang.get('latitude'))
+    print(f"   ✓ Languages: {lang_file} (+ .gz)")
+    print(f"     Size: {json_size / (1024 * 1024):.1f} MB ({gz_size / (1024 * 1024):.1f} MB gzipped)")
 
     # Create metadata
     metadata = {
@@ -273,16 +328,15 @@ def save_enriched_data(people_groups_enriched, languages_enriched):
             'coverage': f'{100 * lang_with_coords / len(languages_enriched):.1f}%'
         },
         'new_fields': {
-            'people_groups': ['country_latitude', 'country_longitude', 'continent', 'region_un', 'coordinate_source'],
-            'languages': ['latitude', 'longitude', 'glottocode', 'family_name', 'family_id', 'macroarea', 'coordinate_source', 'glottolog_match_count']
+            'people_groups': PEOPLE_GROUP_GEO_FIELDS,
+            'languages': LANGUAGE_GEO_FIELDS
         },
         'license': 'Compiled dataset - see individual source licenses',
         'description': 'Joshua Project data enriched with geographic coordinates from Natural Earth and Glottolog'
     }
 
     meta_file = JOSHUA_DIR / 'enrichment_metadata.json'
-    with open(meta_file, 'w', encoding='utf-8') as f:
-        json.dump(metadata, f, indent=2)
+    meta_file.write_bytes(dump_json_bytes(metadata, indent=True))
 
     print(f"   ✓ Metadata: {meta_file}")
 
@@ -322,11 +376,12 @@ def main():
         centroid_lookup, glottolog_lookup, family_lookup, glottocode_to_family = build_lookup_tables(centroids, glottolog, glottolog_languoid)
 
         # Enrich datasets
-        people_groups_enriched = enrich_people_groups(people_groups, centroid_lookup)
-        languages_enriched = enrich_languages(languages, glottolog_lookup, family_lookup, glottocode_to_family)
+        people_groups_enriched, pg_with_coords = enrich_people_groups(people_groups, centroid_lookup)
+        languages_enriched, lang_with_coords = enrich_languages(languages, glottolog_lookup, family_lookup, glottocode_to_family)
 
         # Save results
-        metadata = save_enriched_data(people_groups_enriched, languages_enriched)
+        metadata = save_enriched_data(people_groups_enriched, pg_with_coords,
+                                      languages_enriched, lang_with_coords)
 
         # Print summary
         print_summary(metadata)
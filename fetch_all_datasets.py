@@ -17,14 +17,29 @@ Outputs:
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+from data_utilities import dump_json_bytes
+
 API_KEY = os.environ.get("JOSHUA_PROJECT_API_KEY", "YOUR_API_KEY_HERE")
 BASE_URL = "https://api.joshuaproject.net/v1"
 
+# One pooled session for all fetches (shared by the fetch threads): keeps
+# connections alive and retries transient gateway errors. requests already
+# asks for compressed responses (gzip/deflate, plus br/zstd when installed).
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+))
+
 # Dataset definitions
 DATASETS = {
     "countries": {
@@ -47,22 +62,28 @@ DATASETS = {
     }
 }
 
-def fetch_dataset(dataset_name, endpoint, expected_records):
-    """Fetch a dataset from the API with progress indicators."""
+def fetch_dataset(dataset_name, endpoint, expected_records, log=print):
+    """
+    Fetch a dataset from the API with progress indicators.
+
+    Progress lines go through log (print by default). Concurrent callers
+    pass a per-dataset collector and print the lines themselves, so the
+    output of parallel fetches doesn't interleave.
+    """
     # Use high limit to ensure we get all records
     limit = 20000
     url = f"{BASE_URL}/{endpoint}?api_key={API_KEY}&limit={limit}"
 
-    print(f"\n{'='*60}")
-    print(f"Fetching {dataset_name}...")
-    print(f"Endpoint: {endpoint}")
-    print(f"Expected records: ~{expected_records}")
-    print(f"{'='*60}")
+    log(f"\n{'='*60}")
+    log(f"Fetching {dataset_name}...")
+    log(f"Endpoint: {endpoint}")
+    log(f"Expected records: ~{expected_records}")
+    log(f"{'='*60}")
 
     start_time = time.time()
 
     try:
-        response = requests.get(url, stream=True, timeout=30)
+        response = _SESSION.get(url, timeout=30)
         response.raise_for_status()
 
         # Parse JSON
@@ -70,25 +91,25 @@ def fetch_dataset(dataset_name, endpoint, expected_records):
         duration = time.time() - start_time
 
         count = len(data)
-        print(f"✅ Success! Downloaded {count} records in {duration:.2f} seconds.")
+        log(f"✅ Success! Downloaded {count} {dataset_name} records in {duration:.2f} seconds.")
 
         # Warn if record count differs significantly from expected
         if abs(count - expected_records) > 10:
-            print(f"⚠️  Warning: Expected ~{expected_records} records, got {count}")
+            log(f"⚠️  Warning: Expected ~{expected_records} records, got {count}")
 
         return data
 
     except requests.exceptions.Timeout:
-        print(f"❌ Error: Request timed out after 30 seconds")
+        log(f"❌ Error: Request timed out after 30 seconds")
         return None
     except requests.exceptions.RequestException as e:
-        print(f"❌ Network error: {e}")
+        log(f"❌ Network error: {e}")
         return None
     except json.JSONDecodeError as e:
-        print(f"❌ JSON decode error: {e}")
+        log(f"❌ JSON decode error: {e}")
         return None
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
+        log(f"❌ Unexpected error: {e}")
         return None
 
 def save_dataset(data, filepath, dataset_name):
@@ -96,10 +117,11 @@ def save_dataset(data, filepath, dataset_name):
     print(f"Saving {dataset_name} to {filepath}...")
 
     try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        payload = dump_json_bytes(data, indent=True)
+        with open(filepath, 'wb') as f:
+            f.write(payload)
 
-        size_mb = os.path.getsize(filepath) / (1024 * 1024)
+        size_mb = len(payload) / (1024 * 1024)
         print(f"✅ Saved {size_mb:.2f} MB to {filepath}")
         return True
 
@@ -140,8 +162,8 @@ def create_metadata(results):
     # Save metadata
     metadata_file = "dataset_metadata.json"
     try:
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+        with open(metadata_file, 'wb') as f:
+            f.write(dump_json_bytes(metadata, indent=True))
         print(f"\n✅ Metadata saved to {metadata_file}")
         return True
     except Exception as e:
@@ -158,30 +180,44 @@ def main():
     results = {}
     total_start = time.time()
 
-    # Fetch each dataset
-    for dataset_name, config in DATASETS.items():
-        data = fetch_dataset(
-            dataset_name,
-            config["endpoint"],
-            config["expected_records"]
-        )
-
-        if data:
-            success = save_dataset(data, config["output_file"], dataset_name)
-            results[dataset_name] = {
-                "success": success,
-                "records": len(data),
-                "timestamp": datetime.now().strftime("%Y-%m-%d")
-            }
-        else:
-            results[dataset_name] = {
-                "success": False,
-                "records": 0,
-                "timestamp": None
-            }
-
-        # Brief pause between requests to be polite to the API
-        time.sleep(0.5)
+    # The endpoints are independent, so fetch them concurrently. Each fetch
+    # collects its progress lines; they are printed here, from the main
+    # thread, as each fetch completes.
+    logs = {dataset_name: [] for dataset_name in DATASETS}
+    with ThreadPoolExecutor(max_workers=len(DATASETS)) as executor:
+        futures = {
+            executor.submit(
+                fetch_dataset,
+                dataset_name,
+                config["endpoint"],
+                config["expected_records"],
+                logs[dataset_name].append
+            ): dataset_name
+            for dataset_name, config in DATASETS.items()
+        }
+
+        for future in as_completed(futures):
+            dataset_name = futures[future]
+            config = DATASETS[dataset_name]
+            data = future.result()
+            print("\n".join(logs[dataset_name]))
+
+            if data:
+                success = save_dataset(data, config["output_file"], dataset_name)
+                results[dataset_name] = {
+                    "success": success,
+                    "records": len(data),
+                    "timestamp": datetime.now().strftime("%Y-%m-%d")
+                }
+            else:
+                results[dataset_name] = {
+                    "success": False,
+                    "records": 0,
+                    "timestamp": None
+                }
+
+    # Summary and metadata in DATASETS order, whatever order fetches finished in
+    results = {dataset_name: results[dataset_name] for dataset_name in DATASETS}
 
     total_duration = time.time() - total_start
 
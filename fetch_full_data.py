@@ -2,7 +2,7 @@
 File Purpose: Fetch the complete Joshua Project people groups dataset.
 Primary Functions:
 - Fetches all people group records (up to 20k) from the API.
-- Saves the data to a local JSON file.
+- Streams the response straight to a local JSON file.
 - Provides basic stats on the downloaded data.
 Inputs:
 - API Key (via JOSHUA_PROJECT_API_KEY env var)
@@ -11,55 +11,76 @@ Outputs:
 """
 
 import requests
-import json
 import os
 import time
 
+from data_utilities import iter_json_array
+
 API_KEY = os.environ.get("JOSHUA_PROJECT_API_KEY", "YOUR_API_KEY_HERE")
 BASE_URL = "https://api.joshuaproject.net/v1/people_groups.json"
 OUTPUT_FILE = "joshua_project_full_dump.json"
 
-def fetch_full_dataset():
+# Download chunk size when streaming the response to disk
+CHUNK_SIZE = 1 << 20
+
+def count_records(filepath):
+    """
+    Count the records in a JSON array file (streamed when ijson is installed).
+
+    A top-level value that is not an array counts as 0 records on every
+    path (an API error object is not a dump); malformed JSON raises
+    ValueError.
+    """
+    return sum(1 for _ in iter_json_array(filepath))
+
+def fetch_full_dataset(filepath):
+    """
+    Stream the full people groups response straight into filepath.
+
+    The body is written in CHUNK_SIZE pieces to a .part file, checked, and
+    only then moved over filepath, so a failed download never clobbers the
+    existing dump. Returns the record count, or None on failure.
+    """
     # Based on our check, the total count is ~16k, so 20000 covers it.
     limit = 20000
     url = f"{BASE_URL}?api_key={API_KEY}&limit={limit}"
+    part_file = filepath + '.part'
     
     print(f"Fetching full dataset from {BASE_URL}...")
     print(f"Limit set to: {limit}")
     
     start_time = time.time()
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        # Parse JSON
-        data = response.json()
+        with requests.get(url, stream=True, timeout=60) as response:
+            response.raise_for_status()
+            with open(part_file, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(chunk)
         duration = time.time() - start_time
         
-        count = len(data)
+        count = count_records(part_file)
+        if not count:
+            print("Error: response contained no records; keeping existing file")
+            return None
         print(f"\nSuccess! Downloaded {count} records in {duration:.2f} seconds.")
         
-        return data
+        os.replace(part_file, filepath)
+        size_mb = os.path.getsize(filepath) / (1024 * 1024)
+        print(f"Saved {size_mb:.2f} MB to {filepath}")
+        return count
         
     except requests.exceptions.RequestException as e:
         print(f"Network error: {e}")
         return None
-    except json.JSONDecodeError as e:
+    except ValueError as e:
         print(f"JSON decode error: {e}")
         return None
-
-def save_data(data, filepath):
-    print(f"Saving data to {filepath}...")
-    try:
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        
-        size_mb = os.path.getsize(filepath) / (1024 * 1024)
-        print(f"Saved {size_mb:.2f} MB to {filepath}")
-    except Exception as e:
+    except OSError as e:
         print(f"Error saving file: {e}")
+        return None
+    finally:
+        if os.path.exists(part_file):
+            os.remove(part_file)
 
 if __name__ == "__main__":
-    data = fetch_full_dataset()
-    if data:
-        save_data(data, OUTPUT_FILE)
+    fetch_full_dataset(OUTPUT_FILE)
@@ -6,10 +6,13 @@ Output: souls_enhanced_viz_data.json
 Size target: < 3 MB (compact field names, essential data only)
 """
 
+import collections
 import json
 import sys
 from pathlib import Path
 
+from data_utilities import dump_json_bytes
+
 # Compact field mapping
 COMPACT_FIELDS = {
     'name': 'n',                    # People group name
@@ -63,29 +66,33 @@ def safe_int(value, default=0):
 
 def compact_group(group):
     """Convert a people group record to compact format."""
+    get = group.get
+    country_data = get('country_data')
+    language_data = get('language_data')
+
     compact = {
-        'n': group.get('PeopNameInCountry', 'Unknown'),
-        'p': safe_int(group.get('Population', 0)),
-        's': safe_int(group.get('JPScale', 0)),
-        'e': round(safe_float(group.get('PercentEvangelical', 0)), 1),
-        'r': group.get('PrimaryReligion', 'Unknown'),
-        'l': group.get('PrimaryLanguageName', 'Unknown'),
-        'lc': group.get('ROL3', ''),
-        'c': group.get('country_data', {}).get('name', 'Unknown') if group.get('country_data') else group.get('Ctry', 'Unknown'),
-        'cc': group.get('ROG3', ''),
-        'cn': group.get('Continent', ''),
-        'rg': group.get('RegionName', ''),
-        'ab': group.get('AffinityBloc', ''),
-        'pc': group.get('PeopleCluster', ''),
-        'bs': safe_int(group.get('BibleStatus', 0)),
-        'jf': group.get('language_data', {}).get('has_jesus_film', 'N') if group.get('language_data') else 'N',
-        'lr': group.get('LeastReached', 'N')
+        'n': get('PeopNameInCountry', 'Unknown'),
+        'p': safe_int(get('Population', 0)),
+        's': safe_int(get('JPScale', 0)),
+        'e': round(safe_float(get('PercentEvangelical', 0)), 1),
+        'r': get('PrimaryReligion', 'Unknown'),
+        'l': get('PrimaryLanguageName', 'Unknown'),
+        'lc': get('ROL3', ''),
+        'c': country_data.get('name', 'Unknown') if country_data else get('Ctry', 'Unknown'),
+        'cc': get('ROG3', ''),
+        'cn': get('Continent', ''),
+        'rg': get('RegionName', ''),
+        'ab': get('AffinityBloc', ''),
+        'pc': get('PeopleCluster', ''),
+        'bs': safe_int(get('BibleStatus', 0)),
+        'jf': language_data.get('has_jesus_film', 'N') if language_data else 'N',
+        'lr': get('LeastReached', 'N')
     }
 
     # Add lat/lon if available (some people groups have this)
     # Check common field names
-    lat = group.get('Latitude') or group.get('PrimaryLanguageLatitude')
-    lon = group.get('Longitude') or group.get('PrimaryLanguageLongitude')
+    lat = get('Latitude') or get('PrimaryLanguageLatitude')
+    lon = get('Longitude') or get('PrimaryLanguageLongitude')
 
     if lat and lon:
         lat_val = safe_float(lat, None)
@@ -95,62 +102,87 @@ def compact_group(group):
 
     return compact
 
-def generate_stats(groups):
-    """Generate summary statistics."""
-    stats = {
-        'total_groups': len(groups),
-        'total_population': sum(g['p'] for g in groups),
-        'unreached_count': sum(1 for g in groups if g['lr'] == 'Y'),
-        'unreached_population': sum(g['p'] for g in groups if g['lr'] == 'Y'),
-
-        # By religion
-        'by_religion': {},
-
-        # By continent
-        'by_continent': {},
+def iter_compact_groups(enriched, compact_groups):
+    """
+    Yield each record in compact format, also appending it to compact_groups.
 
-        # By affinity bloc
-        'by_affinity_bloc': {},
+    Feeding this straight into generate_stats converts and aggregates in one
+    pass, so each record is touched once.
+    """
+    for i, group in enumerate(enriched):
+        compact = compact_group(group)
+        compact_groups.append(compact)
+        yield compact
 
-        # By JP Scale
-        'by_jp_scale': {str(i): 0 for i in range(1, 6)},
+        if (i + 1) % 1000 == 0:
+            print(f"  Progress: {i+1:,}/{len(enriched):,}")
 
-        # By Bible status
-        'by_bible_status': {str(i): 0 for i in range(0, 6)}
-    }
+def generate_stats(groups):
+    """Generate summary statistics in a single pass over any iterable of compact groups."""
+    total_groups = 0
+    total_population = 0
+    unreached_count = 0
+    unreached_population = 0
+    by_religion = {}
+    by_continent = {}
+    by_affinity_bloc = {}
+    # Histograms are counted on the integer codes; string keys are built once at the end
+    jp_scale_counts = collections.Counter()
+    bible_status_counts = collections.Counter()
 
     for g in groups:
+        total_groups += 1
+        p = g['p']
+        unreached = g['lr'] == 'Y'
+        total_population += p
+        if unreached:
+            unreached_count += 1
+            unreached_population += p
+
         # Religion
-        if g['r'] not in stats['by_religion']:
-            stats['by_religion'][g['r']] = {'count': 0, 'population': 0, 'unreached': 0}
-        stats['by_religion'][g['r']]['count'] += 1
-        stats['by_religion'][g['r']]['population'] += g['p']
-        if g['lr'] == 'Y':
-            stats['by_religion'][g['r']]['unreached'] += g['p']
+        religion = by_religion.get(g['r'])
+        if religion is None:
+            religion = by_religion[g['r']] = {'count': 0, 'population': 0, 'unreached': 0}
+        religion['count'] += 1
+        religion['population'] += p
+        if unreached:
+            religion['unreached'] += p
 
         # Continent
         if g['cn']:
-            if g['cn'] not in stats['by_continent']:
-                stats['by_continent'][g['cn']] = {'count': 0, 'population': 0}
-            stats['by_continent'][g['cn']]['count'] += 1
-            stats['by_continent'][g['cn']]['population'] += g['p']
+            continent = by_continent.get(g['cn'])
+            if continent is None:
+                continent = by_continent[g['cn']] = {'count': 0, 'population': 0}
+            continent['count'] += 1
+            continent['population'] += p
 
         # Affinity Bloc
         if g['ab']:
-            if g['ab'] not in stats['by_affinity_bloc']:
-                stats['by_affinity_bloc'][g['ab']] = {'count': 0, 'population': 0}
-            stats['by_affinity_bloc'][g['ab']]['count'] += 1
-            stats['by_affinity_bloc'][g['ab']]['population'] += g['p']
+            bloc = by_affinity_bloc.get(g['ab'])
+            if bloc is None:
+                bloc = by_affinity_bloc[g['ab']] = {'count': 0, 'population': 0}
+            bloc['count'] += 1
+            bloc['population'] += p
 
         # JP Scale
         if g['s']:
-            stats['by_jp_scale'][str(g['s'])] += 1
+            jp_scale_counts[g['s']] += 1
 
         # Bible Status
         if g['bs'] is not None:
-            stats['by_bible_status'][str(g['bs'])] += 1
-
-    return stats
+            bible_status_counts[g['bs']] += 1
+
+    return {
+        'total_groups': total_groups,
+        'total_population': total_population,
+        'unreached_count': unreached_count,
+        'unreached_population': unreached_population,
+        'by_religion': by_religion,
+        'by_continent': by_continent,
+        'by_affinity_bloc': by_affinity_bloc,
+        'by_jp_scale': {str(i): jp_scale_counts[i] for i in range(1, 6)},
+        'by_bible_status': {str(i): bible_status_counts[i] for i in range(0, 6)}
+    }
 
 def main():
     print("=" * 70)
@@ -160,22 +192,13 @@ def main():
     # Load enriched data
     enriched = load_enriched_data()
 
-    # Convert to compact format
-    print("\nConverting to compact format...")
+    # Convert to compact format and generate stats in the same pass
+    print("\nConverting to compact format and generating statistics...")
     compact_groups = []
-
-    for i, group in enumerate(enriched):
-        compact_groups.append(compact_group(group))
-
-        if (i + 1) % 1000 == 0:
-            print(f"  Progress: {i+1:,}/{len(enriched):,}")
+    stats = generate_stats(iter_compact_groups(enriched, compact_groups))
 
     print(f"\n✅ Converted {len(compact_groups):,} groups")
 
-    # Generate stats
-    print("\nGenerating statistics...")
-    stats = generate_stats(compact_groups)
-
     # Create output
     output = {
         'groups': compact_groups,
@@ -189,11 +212,12 @@ def main():
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
     print(f"\nSaving to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, separators=(',', ':'), ensure_ascii=False)
+    # Serialize once and write in a single call; the size comes from the payload
+    payload = dump_json_bytes(output)
+    output_file.write_bytes(payload)
 
     # File size
-    size_mb = output_file.stat().st_size / (1024 * 1024)
+    size_mb = len(payload) / (1024 * 1024)
 
     print("\n" + "=" * 70)
     print("SUMMARY")
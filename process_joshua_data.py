@@ -1,21 +1,228 @@
-import json
+import functools
+import hashlib
 import os
 import math
+from operator import itemgetter
+
+import data_utilities
+from data_utilities import dump_json_bytes, intern_label, iter_json_array
+
+try:
+    import msgspec
+except ImportError:  # MessagePack output is skipped without it
+    msgspec = None
 
 # Paths
 INPUT_FILE = "joshua_project_full_dump.json"
 OUTPUT_FILE = "../../souls_viz_data.json"
+# Same data with the groups as parallel arrays: {"stats": ..., "cols": {"n": [...], ...}}
+COLUMNAR_OUTPUT_FILE = "../../souls_viz_data.cols.json"
 
-def process_data():
-    print(f"Loading data from {INPUT_FILE}...")
+# Same document as OUTPUT_FILE in MessagePack (needs msgspec), apart from the
+# rounding below; non-string stats keys are written as their JSON text, so
+# None is "null" in both
+MSGPACK_OUTPUT_FILE = "../../souls_viz_data.msgpack"
+
+# The alternative formats above are opt-in: nothing loads them yet, and
+# each one is another full copy of the data written on every run
+WRITE_COLUMNAR = False
+WRITE_MSGPACK = False
+
+# Digest of the input and of this script from the last successful run;
+# a rerun with both unchanged skips regeneration
+OUTPUT_HASH_FILE = OUTPUT_FILE + ".hash"
+HASH_CHUNK_SIZE = 1 << 20
+
+# Output is written in many small pieces; buffer them into 1 MiB writes
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Float precision kept in the columnar and MessagePack outputs; OUTPUT_FILE,
+# which the front end loads, keeps the source values. This is a deliberate,
+# lossy format change: source coordinates and percentages carry 15-16
+# significant digits, which the viz cannot use. 4 decimals of a degree is
+# ~11 m; 3 decimals of a percentage is 0.001 points. Set either to None to
+# keep full precision.
+COORD_DECIMALS = 4
+PERCENT_DECIMALS = 3
+
+# Compact group keys, in output order. Groups are held as tuples in this
+# order and only turned into {key: value} objects as they are written.
+GROUP_FIELDS = ("n", "b", "p", "r", "s", "e", "c", "ll", "l")
+GROUP_POP = GROUP_FIELDS.index("p")
+GROUP_EVANGELICAL = GROUP_FIELDS.index("e")
+GROUP_LL = GROUP_FIELDS.index("ll")
+
+def input_digest():
+    """
+    Hash the input file's contents together with the source of this script
+    and of data_utilities (which serializes the output), so either a new
+    dump or a change to the transform invalidates the outputs.
+    """
+    digest = hashlib.md5()
+    for filename in (INPUT_FILE, os.path.abspath(__file__), data_utilities.__file__):
+        with open(filename, 'rb') as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def output_files():
+    """Output paths this run is expected to produce."""
+    paths = [OUTPUT_FILE]
+    if WRITE_COLUMNAR:
+        paths.append(COLUMNAR_OUTPUT_FILE)
+    if WRITE_MSGPACK and msgspec is not None:
+        paths.append(MSGPACK_OUTPUT_FILE)
+    return paths
+
+def outputs_up_to_date(digest):
+    """True if every output exists and was produced from the same digest."""
+    if not all(os.path.exists(path) for path in output_files()):
+        return False
+    try:
+        with open(OUTPUT_HASH_FILE, 'r', encoding='utf-8') as f:
+            return f.read().strip() == digest
+    except OSError:
+        return False
+
+def write_json_stream(f, stats, key, items, as_object=False):
+    """
+    Write {"stats": stats, key: ...} to f without building the whole document.
+
+    items is an iterable of plain values written as an array, or of
+    (name, value) pairs written as an object when as_object is set. Each
+    one is serialized and written on its own, so only a single item's
+    bytes are held at a time. The result is byte-identical to
+    dump_json_bytes() of the full dict.
+    """
+    f.write(b'{"stats":' + dump_json_bytes(stats) + b',' + dump_json_bytes(key) + b':')
+    f.write(b'{' if as_object else b'[')
+    for i, item in enumerate(items):
+        if i: f.write(b',')
+        if as_object:
+            name, item = item
+            f.write(dump_json_bytes(name) + b':')
+        f.write(dump_json_bytes(item))
+    f.write(b'}}' if as_object else b']}')
+
+def json_keys(stats):
+    """
+    Copy of stats with each non-string key (None for records without an
+    AffinityBloc) replaced by its JSON text, as the JSON output writes it.
+    """
+    return {key if type(key) is str else dump_json_bytes(key).decode(): value
+            for key, value in stats.items()}
+
+def write_msgpack(f, stats, groups):
+    """
+    Write {"stats": stats, "groups": [...]} to f as MessagePack, with the
+    same keys as the JSON output. groups are sequences of
+    values in GROUP_FIELDS order.
+    """
+    f.write(msgspec.msgpack.encode({
+        "stats": json_keys(stats),
+        "groups": [dict(zip(GROUP_FIELDS, group)) for group in groups],
+    }))
+
+def round_number(value, decimals):
+    """
+    round() for ints and floats. Anything else (a string coordinate from a
+    malformed record) and decimals=None pass through unchanged.
+    """
+    if decimals is None or type(value) not in (int, float):
+        return value
+    return round(value, decimals)
+
+def round_group(group):
+    """Copy of a group tuple with e and ll rounded for the alternative outputs."""
+    group = list(group)
+    group[GROUP_EVANGELICAL] = round_number(group[GROUP_EVANGELICAL], PERCENT_DECIMALS)
+    ll = group[GROUP_LL]
+    if ll is not None:
+        group[GROUP_LL] = [round_number(value, COORD_DECIMALS) for value in ll]
+    return group
+
+# JPScale values that are not plain ints (strings, floats, None) -> normalized
+# status. JPScale only takes a handful of distinct values, so the int() cast
+# and its exception path run once per value instead of once per record.
+@functools.lru_cache(maxsize=256)
+def _cached_status(status_raw):
+    try:
+        return int(status_raw)
+    except (ValueError, TypeError):
+        return 1
+
+def normalize_status(status_raw):
+    """Coerce a raw JPScale value to an int, defaulting to 1 (Unreached)."""
     try:
-        with open(INPUT_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except FileNotFoundError:
+        return _cached_status(status_raw)
+    except TypeError: # unhashable (a list or dict) can't be cached or cast
+        return 1
+
+def transform_record(record):
+    """
+    Convert one people group record to a compact viz row: a tuple of
+    values in GROUP_FIELDS order, much smaller than a per-group dict.
+
+    Returns None for groups filtered out of the visualization. Depends on
+    nothing but the record; the per-bloc totals are kept by the caller.
+    """
+    # Plain get() calls rather than one itemgetter() unpack: itemgetter
+    # raises KeyError on any missing key, and with a try/except fallback
+    # (plus fetching fields of records the filter below drops) it measured
+    # no faster than this.
+    get = record.get # bound once; each field below is one call
+
+    # Skip records with no population (optional, but good for vis).
+    # Checked first so filtered records cost no further field work.
+    pop = get("Population", 0)
+    if pop is None: pop = 0
+    if pop < 100: return None # Skip very small groups for noise reduction? Maybe keep them.
+
+    # Extract relevant fields
+    name = get("PeopNameInCountry")
+    bloc = get("AffinityBloc", "Unknown")
+    religion = get("PrimaryReligion", "Unknown")
+    evangelical_pct = get("PercentEvangelical", 0)
+    # JPS cale: 1=Unreached, 2=Minimally Reached, 3=Superficially Reached, 4=Partially Reached, 5=Significantly Reached
+    status_raw = get("JPScale", 1) 
+    
+    # Normalize status (some might be strings or None); JSON ints need no cast
+    status = status_raw if type(status_raw) is int else normalize_status(status_raw)
+        
+    lat = get("Latitude")
+    lon = get("Longitude")
+    country = get("Ctry", "Unknown")
+    # 0.0 is a real coordinate (equator / prime meridian), so test for None
+    ll = (lat, lon) if lat is not None and lon is not None else None
+    
+    # simplify religion string
+    if not religion: religion = "Unknown"
+    
+    return (
+        name,                                                  # n
+        intern_label(bloc),                                    # b
+        pop,                                                   # p
+        intern_label(religion),                                # r
+        status,                                                # s: 1-5 scale. 1 is unreached (dark/red).
+        float(evangelical_pct) if evangelical_pct else 0.0,    # e
+        intern_label(country),                                 # c
+        ll,                                                    # ll
+        intern_label(get("PrimaryLanguageName", "Unknown"))    # l
+    )
+
+def process_data():
+    if not os.path.exists(INPUT_FILE):
         print(f"Error: {INPUT_FILE} not found.")
         return
 
-    print(f"Loaded {len(data)} records. Processing...")
+    digest = input_digest()
+    if outputs_up_to_date(digest):
+        print(f"{INPUT_FILE} unchanged since the last run; {OUTPUT_FILE} is up to date.")
+        return
+
+    # Records are parsed and processed one at a time
+    print(f"Streaming records from {INPUT_FILE}...")
+    record_count = 0
 
     affinity_blocs = {}
     
@@ -23,73 +230,81 @@ def process_data():
     # For the visualization, we need flat lists of people groups but grouped by Affinity Bloc for the "Cells" view.
     
     processed_groups = []
+    # Consecutive records often share a bloc (groups in the same country or
+    # region), so the current bloc's stats dict is reused until it changes.
+    # Bloc labels are interned, so an identity check suffices.
+    last_bloc = object() # matches no bloc
+    bloc_stats = None
     
-    for record in data:
-        # Extract relevant fields
-        peid = record.get("PeopleID3")
-        name = record.get("PeopNameInCountry")
-        bloc = record.get("AffinityBloc", "Unknown")
-        pop = record.get("Population", 0)
-        religion = record.get("PrimaryReligion", "Unknown")
-        evangelical_pct = record.get("PercentEvangelical", 0)
-        # JPS cale: 1=Unreached, 2=Minimally Reached, 3=Superficially Reached, 4=Partially Reached, 5=Significantly Reached
-        status_raw = record.get("JPScale", 1) 
-        
-        # Normalize status (some might be strings or None)
-        try:
-            status = int(status_raw)
-        except (ValueError, TypeError):
-            status = 1
-            
-        lat = record.get("Latitude")
-        lon = record.get("Longitude")
-        country = record.get("Ctry", "Unknown")
-        
-        # Skip records with no population (optional, but good for vis)
-        if pop is None: pop = 0
-        if pop < 100: continue # Skip very small groups for noise reduction? Maybe keep them.
-        
-        # simplify religion string
-        if not religion: religion = "Unknown"
-        
-        group_data = {
-            "n": name,
-            "b": bloc,
-            "p": pop,
-            "r": religion,
-            "s": status, # 1-5 scale. 1 is unreached (dark/red).
-            "e": float(evangelical_pct) if evangelical_pct else 0.0,
-            "c": country,
-            "ll": [lat, lon] if lat and lon else None,
-            "l": record.get("PrimaryLanguageName", "Unknown")
-        }
-        
+    for record in iter_json_array(INPUT_FILE):
+        record_count += 1
+
+        group_data = transform_record(record)
+        if group_data is None:
+            continue
+        _, bloc, pop, _, status = group_data[:5]
+
         processed_groups.append(group_data)
         
-        # Aggregate stats per bloc
-        if bloc not in affinity_blocs:
-            affinity_blocs[bloc] = {"pop": 0, "groups": 0, "unreached_pop": 0}
+        # Aggregate stats per bloc (a dict lookup only when the bloc changes)
+        if bloc is not last_bloc:
+            bloc_stats = affinity_blocs.get(bloc)
+            if bloc_stats is None:
+                bloc_stats = affinity_blocs[bloc] = {"pop": 0, "groups": 0, "unreached_pop": 0}
+            last_bloc = bloc
         
-        affinity_blocs[bloc]["pop"] += pop
-        affinity_blocs[bloc]["groups"] += 1
+        bloc_stats["pop"] += pop
+        bloc_stats["groups"] += 1
         if status <= 1: # Unreached
-             affinity_blocs[bloc]["unreached_pop"] += pop
+             bloc_stats["unreached_pop"] += pop
+
+    print(f"Processed {record_count} records.")
 
     # Combine into final structure
-    # We might want to sort affinity blocs by population to help layout
+    # Sort affinity blocs by population (largest first) to help layout, and
+    # precompute each bloc's unreached share so the client doesn't have to
+    for bloc_stats in affinity_blocs.values():
+        bloc_pop = bloc_stats["pop"]
+        bloc_stats["unreached_pct"] = round(100 * bloc_stats["unreached_pop"] / bloc_pop, 2) if bloc_pop else 0
+    affinity_blocs = dict(sorted(affinity_blocs.items(), key=lambda item: item[1]["pop"], reverse=True))
     
     # Sort groups by population descending for better rendering (draw big ones first or last?)
     # Actually for Voronoi, order doesn't equate to z-index exactly, but for list views it helps.
-    processed_groups.sort(key=lambda x: x['p'], reverse=True)
+    processed_groups.sort(key=itemgetter(GROUP_POP), reverse=True)
     
-    output_data = {
-        "stats": affinity_blocs,
-        "groups": processed_groups
-    }
-
+    # Written group by group (minified) so the full document is never
+    # held in memory next to the groups themselves; each row becomes a
+    # {key: value} object only while it is being written
     print(f"Writing {len(processed_groups)} groups to {OUTPUT_FILE}...")
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(output_data, f, separators=(',', ':')) # Minified
+    group_objects = (dict(zip(GROUP_FIELDS, group)) for group in processed_groups)
+    with open(OUTPUT_FILE, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        write_json_stream(f, affinity_blocs, "groups", group_objects)
+
+    # The alternative outputs carry rounded floats (see COORD_DECIMALS)
+    if WRITE_COLUMNAR or WRITE_MSGPACK:
+        extra_groups = [round_group(group) for group in processed_groups]
+
+    # Columnar copy: each key is written once instead of once per group,
+    # and numeric columns can be loaded straight into typed arrays.
+    # Columns are built one at a time as they are written.
+    if WRITE_COLUMNAR:
+        columns = ((key, [group[i] for group in extra_groups]) for i, key in enumerate(GROUP_FIELDS))
+
+        print(f"Writing columnar groups to {COLUMNAR_OUTPUT_FILE}...")
+        with open(COLUMNAR_OUTPUT_FILE, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            write_json_stream(f, affinity_blocs, "cols", columns, as_object=True)
+
+    # Binary copy: numbers are stored as packed ints/floats instead of text
+    if WRITE_MSGPACK and msgspec is not None:
+        print(f"Writing MessagePack groups to {MSGPACK_OUTPUT_FILE}...")
+        with open(MSGPACK_OUTPUT_FILE, 'wb') as f:
+            write_msgpack(f, affinity_blocs, extra_groups)
+    elif WRITE_MSGPACK:
+        print(f"msgspec not installed; skipping {MSGPACK_OUTPUT_FILE}")
+
+    # Recorded last, so an interrupted write is regenerated next time
+    with open(OUTPUT_HASH_FILE, 'w', encoding='utf-8') as f:
+        f.write(digest + "\n")
     
     print("Done.")
 
@@ -0,0 +1,139 @@
+"""
+Small-input tests for the streaming writers in create_enriched_datasets.py.
+
+Run from the repository root: python -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import create_enriched_datasets as ced
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+def make_record(i, least_reached):
+    return {
+        'PeopleID3': i,
+        'PeopNameInCountry': f'Group {i}',
+        'Population': 1000 + i,
+        'LeastReached': 'Y' if least_reached else 'N',
+        'country_data': {'name': 'Country', 'latitude': 1.5},
+        'language_data': None,
+    }
+
+
+def write_records(tmp_path, records):
+    """Stream records through a full writer with an unreached subset."""
+    full = ced.ParquetBatchWriter(str(tmp_path / 'full.parquet'), 'full')
+    unreached = ced.ParquetBatchWriter(str(tmp_path / 'unreached.parquet'), 'unreached')
+    full.add_subset(unreached, 'LeastReached', 'Y')
+    for record in records:
+        full.write(record)
+    return full.close(), unreached.close()
+
+
+def test_subset_smaller_than_one_batch(tmp_path):
+    records = [make_record(i, i < 34) for i in range(50)]
+
+    assert write_records(tmp_path, records) == (True, True)
+
+    full = pq.read_table(tmp_path / 'full.parquet')
+    unreached = pq.read_table(tmp_path / 'unreached.parquet')
+    assert full.num_rows == 50
+    assert unreached.num_rows == 34
+    assert unreached.schema == full.schema
+    assert unreached.column('PeopleID3').to_pylist() == list(range(34))
+
+
+def test_empty_subset_uses_parent_schema(tmp_path):
+    records = [make_record(i, False) for i in range(10)]
+
+    assert write_records(tmp_path, records) == (True, True)
+
+    unreached = pq.read_table(tmp_path / 'unreached.parquet')
+    assert unreached.num_rows == 0
+    assert unreached.schema == pq.read_table(tmp_path / 'full.parquet').schema
+
+
+def test_schema_widens_for_late_values(tmp_path):
+    # Extra is all null for the first batches, then int; Score goes int -> float
+    records = []
+    for i in range(10000):
+        record = make_record(i, i % 3 == 0)
+        record['Extra'] = None if i < 5000 else 7
+        record['Score'] = 1 if i < 5000 else 2.5
+        records.append(record)
+
+    assert write_records(tmp_path, records) == (True, True)
+
+    full = pq.read_table(tmp_path / 'full.parquet')
+    assert full.num_rows == 10000
+    assert full.schema.field('Extra').type == pa.int64()
+    assert full.schema.field('Score').type == pa.float64()
+    assert full.column('Extra').to_pylist() == [None] * 5000 + [7] * 5000
+    assert full.column('Score').to_pylist() == [1.0] * 5000 + [2.5] * 5000
+
+    unreached = pq.read_table(tmp_path / 'unreached.parquet')
+    assert unreached.num_rows == 3334
+    assert unreached.schema == full.schema
+    assert unreached.column('Extra').to_pylist() == [
+        None if i < 5000 else 7 for i in range(0, 10000, 3)]
+
+
+def test_failed_write_leaves_no_partial_file(tmp_path):
+    # Strings then ints in one column cannot be unified
+    records = [make_record(i, True) for i in range(5000)]
+    for i, record in enumerate(records):
+        record['Mixed'] = 'text' if i < 4096 else 1
+
+    assert write_records(tmp_path, records) == (False, False)
+    assert sorted(path.name for path in tmp_path.iterdir()) == []
+
+
+def test_malformed_input_raises_value_error(tmp_path):
+    dump = tmp_path / 'dump.json'
+    dump.write_text('[{"PeopleID3": 1}, {"PeopleID3": ')
+
+    with pytest.raises(ValueError):
+        list(ced.iter_json_array(str(dump)))
+
+
+def test_aborted_json_writer_leaves_no_partial_file(tmp_path):
+    writer = ced.JsonArrayWriter(str(tmp_path / 'out.json'), 'out', gzip=True)
+    writer.write(make_record(1, True))
+    writer.abort()
+
+    assert not writer.close()
+    assert sorted(path.name for path in tmp_path.iterdir()) == []
+
+
+@pytest.mark.parametrize('cached', [{'lookups': {}}, ['lookups'], None])
+def test_bad_lookup_cache_is_ignored(tmp_path, cached):
+    cache_path = tmp_path / 'lookups.pkl'
+    cache_path.write_bytes(ced.pickle.dumps(cached))
+
+    assert ced.load_lookup_cache(str(cache_path)) is None
+
+
+def test_lookup_cache_round_trip(tmp_path):
+    cache_path = tmp_path / 'lookups.pkl'
+    cache_path.write_bytes(ced.pickle.dumps({'lookups': {'a': 1}, 'source_counts': {'a': 2}}))
+
+    assert ced.load_lookup_cache(str(cache_path)) == ({'a': 1}, {'a': 2})
+
+
+def test_schema_rewrites_are_bounded_by_columns(tmp_path, capsys):
+    # One widening when Extra first gets a value, none for the later batches
+    records = [make_record(i, True) for i in range(20 * ced.PARQUET_BATCH_SIZE)]
+    for i, record in enumerate(records):
+        record['Extra'] = None if i < ced.PARQUET_BATCH_SIZE else i
+
+    assert write_records(tmp_path, records) == (True, True)
+
+    assert capsys.readouterr().out.count('Widening schema of') == 2  # full + unreached
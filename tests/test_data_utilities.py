@@ -0,0 +1,28 @@
+"""
+Tests for the optional-dependency handling in data_utilities.py.
+
+Run from the repository root: python -m pytest -q tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import data_utilities
+
+
+@pytest.mark.parametrize("call, name", [
+    (lambda: data_utilities.load_arrow.__wrapped__(), "load_arrow"),
+    (lambda: data_utilities.load_arrow_mmap.__wrapped__(), "load_arrow_mmap"),
+    (lambda: data_utilities.query_arrow('ROG3', 'IN'), "query_arrow"),
+])
+def test_arrow_entry_points_report_missing_pyarrow(monkeypatch, call, name):
+    def missing(module):
+        raise ImportError(f"No module named {module!r}")
+    monkeypatch.setattr(data_utilities.importlib, "import_module", missing)
+
+    with pytest.raises(ImportError, match=f"^{name} requires pyarrow"):
+        call()
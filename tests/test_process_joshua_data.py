@@ -0,0 +1,167 @@
+"""
+Small-input tests for the output writers and rerun gate in process_joshua_data.py.
+
+Run from the repository root: python -m pytest -q tests
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import process_joshua_data as pjd
+from data_utilities import dump_json_bytes
+
+
+STATS = {
+    "Unknown": {"pop": 500, "groups": 2, "unreached_pop": 200, "unreached_pct": 40.0},
+    None: {"pop": 300, "groups": 1, "unreached_pop": 0, "unreached_pct": 0},
+}
+
+
+def make_group(i):
+    return (f"Group {i}", "Unknown", 1000 + i, "Islam", i % 5 + 1, 0.25 * i,
+            "Country", (1.5, -0.0) if i % 2 else None, "Language")
+
+
+def make_record(i, bloc="Bloc"):
+    return {
+        "PeopNameInCountry": f"Group {i}",
+        "AffinityBloc": bloc,
+        "Population": 1000 * (i + 1),
+        "PrimaryReligion": "Islam",
+        "PercentEvangelical": 1.5,
+        "JPScale": i % 5 + 1,
+        "Latitude": 0.0,
+        "Longitude": 10.0 + i,
+        "Ctry": "Country",
+        "PrimaryLanguageName": "Language",
+    }
+
+
+@pytest.mark.parametrize("count", [0, 1, 100])
+def test_write_json_stream_matches_one_shot_dump(count):
+    groups = [dict(zip(pjd.GROUP_FIELDS, make_group(i))) for i in range(count)]
+    f = io.BytesIO()
+
+    pjd.write_json_stream(f, STATS, "groups", groups)
+
+    assert f.getvalue() == dump_json_bytes({"stats": STATS, "groups": groups})
+
+
+def test_write_json_stream_object_matches_one_shot_dump():
+    columns = {key: [make_group(i)[k] for i in range(10)]
+               for k, key in enumerate(pjd.GROUP_FIELDS)}
+    f = io.BytesIO()
+
+    pjd.write_json_stream(f, STATS, "cols", columns.items(), as_object=True)
+
+    assert f.getvalue() == dump_json_bytes({"stats": STATS, "cols": columns})
+
+
+@pytest.mark.parametrize("count", [0, 15, 16, 65536])
+def test_write_msgpack_matches_json_output(count):
+    msgspec = pytest.importorskip("msgspec")
+    groups = [make_group(i) for i in range(count)]
+    f = io.BytesIO()
+
+    pjd.write_msgpack(f, STATS, groups)
+
+    expected = json.loads(dump_json_bytes(
+        {"stats": STATS, "groups": [dict(zip(pjd.GROUP_FIELDS, g)) for g in groups]}))
+    assert msgspec.msgpack.decode(f.getvalue()) == expected
+    assert "null" in expected["stats"]
+
+
+@pytest.fixture
+def outputs(tmp_path, monkeypatch):
+    """Point the script's input and outputs at tmp_path."""
+    monkeypatch.setattr(pjd, "INPUT_FILE", str(tmp_path / "dump.json"))
+    monkeypatch.setattr(pjd, "OUTPUT_FILE", str(tmp_path / "out.json"))
+    monkeypatch.setattr(pjd, "OUTPUT_HASH_FILE", str(tmp_path / "out.json.hash"))
+    monkeypatch.setattr(pjd, "COLUMNAR_OUTPUT_FILE", str(tmp_path / "out.cols.json"))
+    monkeypatch.setattr(pjd, "MSGPACK_OUTPUT_FILE", str(tmp_path / "out.msgpack"))
+    (tmp_path / "dump.json").write_text(json.dumps([make_record(i) for i in range(5)]))
+    return tmp_path
+
+
+def test_outputs_up_to_date(outputs):
+    digest = pjd.input_digest()
+    assert not pjd.outputs_up_to_date(digest)
+
+    pjd.process_data()
+    assert pjd.outputs_up_to_date(digest)
+    assert sorted(path.name for path in outputs.iterdir()) == [
+        "dump.json", "out.json", "out.json.hash"]
+
+    (outputs / "dump.json").write_text(json.dumps([make_record(i) for i in range(6)]))
+    assert not pjd.outputs_up_to_date(pjd.input_digest())
+
+
+def test_outputs_up_to_date_needs_enabled_outputs(outputs, monkeypatch):
+    pjd.process_data()
+    digest = pjd.input_digest()
+
+    monkeypatch.setattr(pjd, "WRITE_COLUMNAR", True)
+    assert not pjd.outputs_up_to_date(digest)
+
+    pjd.process_data()
+    assert pjd.outputs_up_to_date(digest)
+    cols = json.loads((outputs / "out.cols.json").read_text())
+    assert cols["cols"]["p"] == [5000, 4000, 3000, 2000, 1000]
+
+
+def test_process_data_msgpack_matches_json(outputs, monkeypatch):
+    msgspec = pytest.importorskip("msgspec")
+    monkeypatch.setattr(pjd, "WRITE_MSGPACK", True)
+    (outputs / "dump.json").write_text(json.dumps(
+        [make_record(i, bloc=None if i % 2 else "Bloc") for i in range(5)]))
+
+    pjd.process_data()
+
+    packed = msgspec.msgpack.decode((outputs / "out.msgpack").read_bytes())
+    assert packed == json.loads((outputs / "out.json").read_text())
+    assert set(packed["stats"]) == {"Bloc", "null"}
+
+
+@pytest.mark.parametrize("raw, status", [
+    (3, 3), (2.0, 2), ("4", 4), ("", 1), ("n/a", 1), (None, 1),
+    ([2], 1), ({"scale": 2}, 1),
+])
+def test_normalize_status(raw, status):
+    assert pjd.normalize_status(raw) == status
+
+
+def test_transform_record_keeps_unhashable_status():
+    record = make_record(0)
+    record["JPScale"] = [2]
+
+    assert pjd.transform_record(record)[pjd.GROUP_FIELDS.index("s")] == 1
+
+
+def test_rounding_only_applies_to_alternative_outputs(outputs, monkeypatch):
+    monkeypatch.setattr(pjd, "WRITE_COLUMNAR", True)
+    record = make_record(0)
+    record.update(Latitude=12.3456789, Longitude="34.5", PercentEvangelical=1.23456)
+    (outputs / "dump.json").write_text(json.dumps([record]))
+
+    pjd.process_data()
+
+    group = json.loads((outputs / "out.json").read_text())["groups"][0]
+    assert group["ll"] == [12.3456789, "34.5"]
+    assert group["e"] == 1.23456
+    cols = json.loads((outputs / "out.cols.json").read_text())["cols"]
+    assert cols["ll"] == [[12.3457, "34.5"]]
+    assert cols["e"] == [1.235]
+
+
+def test_rounding_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(pjd, "COORD_DECIMALS", None)
+    monkeypatch.setattr(pjd, "PERCENT_DECIMALS", None)
+    group = pjd.transform_record(dict(make_record(0), Latitude=1.23456789))
+
+    assert pjd.round_group(group) == list(group[:7]) + [[1.23456789, 10.0], "Language"]